@@ -0,0 +1,41 @@
+"""parent_series_partial_index
+
+Revision ID: a7e4b9d25c18
+Revises: f3a8d2c71e56
+Create Date: 2026-08-30 16:03:28.514902
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'a7e4b9d25c18'
+down_revision = 'f3a8d2c71e56'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Index the recurring-series lookup columns.
+
+    update_series filters by parent_task_id and completed and the
+    instance listings order by due_date; the composite partial index
+    serves those as range scans. parent_task_id IS NOT NULL keeps it
+    tiny (the Todoist-style completion path leaves parent NULL on most
+    rows) and makes the old single-column parent_task_id index - whose
+    prefix it subsumes - pure write overhead, so that one is dropped.
+    """
+    op.execute("DROP INDEX IF EXISTS ix_tasks_parent_task_id")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_parent_completed_due "
+        "ON tasks (parent_task_id, completed, due_date) "
+        "WHERE parent_task_id IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    """Restore the single-column parent index."""
+    op.execute("DROP INDEX IF EXISTS ix_tasks_parent_completed_due")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_parent_task_id "
+        "ON tasks (parent_task_id)"
+    )
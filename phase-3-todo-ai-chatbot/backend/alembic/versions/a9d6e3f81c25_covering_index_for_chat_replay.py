@@ -0,0 +1,38 @@
+"""covering index on messages (conversation_id, created_at) for chat replay
+
+Revision ID: a9d6e3f81c25
+Revises: f7c4b9e02a61
+Create Date: 2026-08-30 00:00:00.000000
+
+The dominant read is "load messages for conversation X in chronological
+order". With the plain composite index every row still costs a heap
+fetch for role/content. INCLUDE-ing the payload columns lets the planner
+answer the query with an index-only scan (verify with EXPLAIN (ANALYZE,
+BUFFERS)); the old composite becomes redundant and is dropped.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d6e3f81c25'
+down_revision = 'f7c4b9e02a61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_messages_conv_created_covering "
+        "ON messages (conversation_id, created_at) "
+        "INCLUDE (role, content, chatkit_item_id) "
+        "WITH (fillfactor = 90)"
+    )
+    op.execute("DROP INDEX IF EXISTS ix_messages_conv_created")
+
+
+def downgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_messages_conv_created "
+        "ON messages (conversation_id, created_at)"
+    )
+    op.execute("DROP INDEX IF EXISTS ix_messages_conv_created_covering")
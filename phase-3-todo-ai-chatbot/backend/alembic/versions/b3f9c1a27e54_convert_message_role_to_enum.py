@@ -0,0 +1,44 @@
+"""convert messages.role to native message_role enum
+
+Revision ID: b3f9c1a27e54
+Revises: a1b2c3d4e5f6
+Create Date: 2026-08-30 00:00:00.000000
+
+Converts messages.role from VARCHAR to a native PostgreSQL ENUM.
+Enum storage is 4 bytes/row vs variable-length text, shrinking the table
+and any index containing role, and constrains values at the DB level.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3f9c1a27e54'
+down_revision = 'a1b2c3d4e5f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create the enum type if missing, then retype the column in place.
+    # Existing rows already hold the lowercase values, so the USING cast
+    # succeeds without a data rewrite pass.
+    op.execute("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'message_role') THEN
+                CREATE TYPE message_role AS ENUM ('user', 'assistant', 'system');
+            END IF;
+        END $$;
+    """)
+    op.execute(
+        "ALTER TABLE messages ALTER COLUMN role TYPE message_role "
+        "USING role::message_role"
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE messages ALTER COLUMN role TYPE VARCHAR "
+        "USING role::text"
+    )
+    op.execute("DROP TYPE IF EXISTS message_role")
@@ -0,0 +1,50 @@
+"""chatkit_store_read_path_indexes
+
+Revision ID: b8d3f6a41c09
+Revises: c4e1f8a95b37
+Create Date: 2026-08-30 13:40:17.529841
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'b8d3f6a41c09'
+down_revision = 'c4e1f8a95b37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Index the ChatKit store read paths.
+
+    load_thread_items filters user_id on top of (conversation_id,
+    created_at); user_id was the one column missing from the covering
+    index's INCLUDE list, so every row still paid a heap fetch to check
+    it. Rebuilding the index with user_id included restores the
+    index-only scan. load_threads orders a user's conversations by
+    updated_at DESC; (user_id, updated_at) lets the planner walk the
+    index backwards instead of sorting.
+    """
+    op.execute("DROP INDEX IF EXISTS ix_messages_conv_created_covering")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_messages_conv_created_covering "
+        "ON messages (conversation_id, created_at) "
+        "INCLUDE (role, content, chatkit_item_id, user_id) "
+        "WITH (fillfactor = 90)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_conversations_user_updated "
+        "ON conversations (user_id, updated_at)"
+    )
+
+
+def downgrade() -> None:
+    """Restore the narrower covering index and drop the composite."""
+    op.execute("DROP INDEX IF EXISTS ix_conversations_user_updated")
+    op.execute("DROP INDEX IF EXISTS ix_messages_conv_created_covering")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_messages_conv_created_covering "
+        "ON messages (conversation_id, created_at) "
+        "INCLUDE (role, content, chatkit_item_id) "
+        "WITH (fillfactor = 90)"
+    )
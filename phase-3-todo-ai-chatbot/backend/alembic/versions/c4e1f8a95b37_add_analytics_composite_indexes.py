@@ -0,0 +1,46 @@
+"""add_analytics_composite_indexes
+
+Revision ID: c4e1f8a95b37
+Revises: a9d6e3f81c25
+Create Date: 2026-08-30 10:15:42.118203
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'c4e1f8a95b37'
+down_revision = 'a9d6e3f81c25'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add composite indexes supporting the analytics WHERE clauses.
+
+    The analytics queries all filter by user_id plus one of
+    (completed, updated_at), (parent_task_id, completed), or
+    (created_at). Without these composites the planner falls back to
+    per-user scans over the whole tasks table; with them the heatmap,
+    streak, recurring-stats, and date-range queries become index range
+    scans. (user_id, priority) is already covered by
+    ix_tasks_user_priority from the priority migration.
+    """
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_user_completed_updated "
+        "ON tasks (user_id, completed, updated_at)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_user_parent_completed "
+        "ON tasks (user_id, parent_task_id, completed)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_user_created "
+        "ON tasks (user_id, created_at)"
+    )
+
+
+def downgrade() -> None:
+    """Drop the analytics composite indexes."""
+    op.execute("DROP INDEX IF EXISTS ix_tasks_user_created")
+    op.execute("DROP INDEX IF EXISTS ix_tasks_user_parent_completed")
+    op.execute("DROP INDEX IF EXISTS ix_tasks_user_completed_updated")
@@ -0,0 +1,69 @@
+"""drop single-column message indexes covered by the composite
+
+Revision ID: e5a2c7d19f38
+Revises: d12e8a40f6b7
+Create Date: 2026-08-30 00:00:00.000000
+
+The composite (conversation_id, created_at) index serves both the
+conversation filter and the chronological load, so the single-column
+B-trees on conversation_id and created_at are redundant write overhead
+on every message insert. Renames the 002-era composite to match the
+model declaration and drops the overlapping single-column indexes.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a2c7d19f38'
+down_revision = 'd12e8a40f6b7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Rename the existing composite (created by 002_add_chat_tables) to the
+    # model's name, or create it fresh if this DB never had it.
+    op.execute("""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM pg_indexes
+                WHERE tablename = 'messages' AND indexname = 'idx_messages_conversation_created'
+            ) THEN
+                ALTER INDEX idx_messages_conversation_created RENAME TO ix_messages_conv_created;
+            ELSIF NOT EXISTS (
+                SELECT 1 FROM pg_indexes
+                WHERE tablename = 'messages' AND indexname = 'ix_messages_conv_created'
+            ) THEN
+                CREATE INDEX ix_messages_conv_created ON messages (conversation_id, created_at);
+            END IF;
+        END $$;
+    """)
+
+    # Single-column indexes fully covered by the composite's prefix / unused
+    op.execute("DROP INDEX IF EXISTS idx_messages_conversation_id")
+    op.execute("DROP INDEX IF EXISTS ix_messages_conversation_id")
+    op.execute("DROP INDEX IF EXISTS idx_messages_created_at")
+    op.execute("DROP INDEX IF EXISTS ix_messages_created_at")
+
+
+def downgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_messages_conversation_id "
+        "ON messages (conversation_id)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_messages_created_at "
+        "ON messages (created_at)"
+    )
+    op.execute("""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM pg_indexes
+                WHERE tablename = 'messages' AND indexname = 'ix_messages_conv_created'
+            ) THEN
+                ALTER INDEX ix_messages_conv_created RENAME TO idx_messages_conversation_created;
+            END IF;
+        END $$;
+    """)
@@ -0,0 +1,49 @@
+"""add_recurrence_days_mask
+
+Revision ID: f3a8d2c71e56
+Revises: b8d3f6a41c09
+Create Date: 2026-08-30 15:12:44.108263
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'f3a8d2c71e56'
+down_revision = 'b8d3f6a41c09'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add the denormalized weekday mask for recurrence_days.
+
+    Recurrence calculations parsed the "mon,wed,fri" string on every
+    read; the mask column (bit 0 = Monday) is populated at write time so
+    read paths use constant-time bit operations instead. The string
+    column stays for API compatibility and human readability. Existing
+    rows are backfilled here; the service layer also falls back to
+    parsing the string when the mask is NULL.
+    """
+    op.execute(
+        "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS recurrence_days_mask INTEGER"
+    )
+    # Day-name matching is unambiguous: each three-letter abbreviation
+    # occurs only in its own full day name.
+    op.execute(
+        """
+        UPDATE tasks SET recurrence_days_mask =
+              (CASE WHEN lower(recurrence_days) LIKE '%mon%' THEN 1 ELSE 0 END)
+            + (CASE WHEN lower(recurrence_days) LIKE '%tue%' THEN 2 ELSE 0 END)
+            + (CASE WHEN lower(recurrence_days) LIKE '%wed%' THEN 4 ELSE 0 END)
+            + (CASE WHEN lower(recurrence_days) LIKE '%thu%' THEN 8 ELSE 0 END)
+            + (CASE WHEN lower(recurrence_days) LIKE '%fri%' THEN 16 ELSE 0 END)
+            + (CASE WHEN lower(recurrence_days) LIKE '%sat%' THEN 32 ELSE 0 END)
+            + (CASE WHEN lower(recurrence_days) LIKE '%sun%' THEN 64 ELSE 0 END)
+        WHERE recurrence_days IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop the denormalized mask column."""
+    op.execute("ALTER TABLE tasks DROP COLUMN IF EXISTS recurrence_days_mask")
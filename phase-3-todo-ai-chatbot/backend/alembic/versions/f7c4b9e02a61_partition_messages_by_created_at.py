@@ -0,0 +1,151 @@
+"""partition messages by created_at for O(1) retention drops
+
+Revision ID: f7c4b9e02a61
+Revises: e5a2c7d19f38
+Create Date: 2026-08-30 00:00:00.000000
+
+Rebuilds messages as a native range-partitioned table (daily partitions
+on created_at). The retention job can then DROP whole partitions - a
+metadata-only operation - instead of mass-deleting rows, which rewrote
+pages, bloated indexes and triggered autovacuum on the hot insert path.
+
+Postgres requires the partition key in the primary key, so the PK
+becomes (id, created_at); nothing references messages by FK, so this is
+safe. Existing rows are copied into freshly created daily partitions.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7c4b9e02a61'
+down_revision = 'e5a2c7d19f38'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Move the old table and its schema-wide index/constraint names aside
+    op.execute("ALTER TABLE messages RENAME TO messages_unpartitioned")
+    op.execute(
+        "ALTER TABLE messages_unpartitioned "
+        "RENAME CONSTRAINT messages_pkey TO messages_unpartitioned_pkey"
+    )
+    for name in (
+        "ix_messages_conv_created",
+        "idx_messages_conversation_created",
+        "ix_messages_user_id",
+        "idx_messages_user_id",
+        "ix_messages_expires_at_brin",
+        "ix_messages_chatkit_item_id",
+    ):
+        op.execute(f"ALTER INDEX IF EXISTS {name} RENAME TO {name}_old")
+
+    # Partitioned parent, mirroring the column types the migrations built up
+    op.execute("""
+        CREATE TABLE messages (
+            id UUID NOT NULL DEFAULT gen_random_uuid(),
+            chatkit_item_id VARCHAR NOT NULL,
+            conversation_id UUID NOT NULL REFERENCES conversations(id) ON DELETE CASCADE,
+            user_id VARCHAR NOT NULL,
+            role message_role NOT NULL,
+            content TEXT NOT NULL,
+            tool_calls JSONB DEFAULT NULL,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            expires_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT (now() + INTERVAL '2 days'),
+            PRIMARY KEY (id, created_at),
+            CONSTRAINT check_user_message_length
+                CHECK (role != 'user' OR length(content) <= 2000)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute(
+        "CREATE INDEX ix_messages_conv_created ON messages (conversation_id, created_at)"
+    )
+    op.execute("CREATE INDEX ix_messages_user_id ON messages (user_id)")
+    op.execute("CREATE INDEX ix_messages_chatkit_item_id ON messages (chatkit_item_id)")
+    op.execute(
+        "CREATE INDEX ix_messages_expires_at_brin ON messages "
+        "USING brin (expires_at) WITH (pages_per_range = 32)"
+    )
+
+    # Daily partitions covering existing data plus a 2-day runway, then copy
+    op.execute("""
+        DO $$
+        DECLARE
+            start_day date;
+            end_day date;
+            d date;
+            part text;
+        BEGIN
+            SELECT COALESCE(min(created_at)::date, CURRENT_DATE)
+              INTO start_day FROM messages_unpartitioned;
+            SELECT GREATEST(
+                CURRENT_DATE,
+                COALESCE((SELECT max(created_at)::date FROM messages_unpartitioned), CURRENT_DATE)
+            ) + 2 INTO end_day;
+            d := start_day;
+            WHILE d <= end_day LOOP
+                part := 'messages_p' || to_char(d, 'YYYYMMDD');
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF messages '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    part, d, d + 1
+                );
+                d := d + 1;
+            END LOOP;
+        END $$;
+    """)
+    op.execute("""
+        INSERT INTO messages
+            (id, chatkit_item_id, conversation_id, user_id, role, content,
+             tool_calls, created_at, expires_at)
+        SELECT id, chatkit_item_id, conversation_id, user_id, role, content,
+               tool_calls, created_at, expires_at
+        FROM messages_unpartitioned
+    """)
+    op.execute("DROP TABLE messages_unpartitioned")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE messages RENAME TO messages_partitioned")
+    for name in (
+        "ix_messages_conv_created",
+        "ix_messages_user_id",
+        "ix_messages_chatkit_item_id",
+        "ix_messages_expires_at_brin",
+    ):
+        op.execute(f"ALTER INDEX IF EXISTS {name} RENAME TO {name}_part")
+
+    op.execute("""
+        CREATE TABLE messages (
+            id UUID NOT NULL DEFAULT gen_random_uuid(),
+            chatkit_item_id VARCHAR NOT NULL,
+            conversation_id UUID NOT NULL REFERENCES conversations(id) ON DELETE CASCADE,
+            user_id VARCHAR NOT NULL,
+            role message_role NOT NULL,
+            content TEXT NOT NULL,
+            tool_calls JSONB DEFAULT NULL,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            expires_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT (now() + INTERVAL '2 days'),
+            PRIMARY KEY (id),
+            CONSTRAINT check_user_message_length
+                CHECK (role != 'user' OR length(content) <= 2000)
+        )
+    """)
+    op.execute("""
+        INSERT INTO messages
+            (id, chatkit_item_id, conversation_id, user_id, role, content,
+             tool_calls, created_at, expires_at)
+        SELECT id, chatkit_item_id, conversation_id, user_id, role, content,
+               tool_calls, created_at, expires_at
+        FROM messages_partitioned
+    """)
+    op.execute("DROP TABLE messages_partitioned")
+    op.execute(
+        "CREATE INDEX ix_messages_conv_created ON messages (conversation_id, created_at)"
+    )
+    op.execute("CREATE INDEX ix_messages_user_id ON messages (user_id)")
+    op.execute("CREATE INDEX ix_messages_chatkit_item_id ON messages (chatkit_item_id)")
+    op.execute(
+        "CREATE INDEX ix_messages_expires_at_brin ON messages "
+        "USING brin (expires_at) WITH (pages_per_range = 32)"
+    )
@@ -81,6 +81,19 @@ def _clear_task_service_cache():
     _mock_task_service = None
 
 
+# Priority keyword patterns, precompiled once at module load as single
+# alternations so detection is one pass over the text per tier instead of
+# a sequential loop of ~19 separate re.search calls per message.
+_HIGH_PRIORITY_RE = re.compile(
+    r'\b(?:high\s*priority|urgent|critical|important|asap|high'
+    r'|emergency|immediately|today|must)\b'
+)
+_LOW_PRIORITY_RE = re.compile(
+    r'\b(?:low\s*priority|minor|optional|when\s*you\s*have\s*time'
+    r'|someday|eventually|if\s*possible|maybe|low)\b'
+)
+
+
 def detect_priority_from_text(text: str) -> str:
     """
     Detect priority level from user input text using NLP patterns.
@@ -101,46 +114,12 @@ def detect_priority_from_text(text: str) -> str:
     """
     text_lower = text.lower()
 
-    # High priority patterns
-    high_priority_patterns = [
-        r'\bhigh\s*priority\b',
-        r'\burgent\b',
-        r'\bcritical\b',
-        r'\bimportant\b',
-        r'\basap\b',
-        r'\bhigh\b',
-        r'\bemergency\b',
-        r'\bimmediately\b',
-        r'\btoday\b',
-        r'\bmust\b',
-    ]
-
-    # Low priority patterns
-    low_priority_patterns = [
-        r'\blow\s*priority\b',
-        r'\bminor\b',
-        r'\boptional\b',
-        r'\bwhen\s*you\s*have\s*time\b',
-        r'\bsomeday\b',
-        r'\beventually\b',
-        r'\bif\s*possible\b',
-        r'\bmaybe\b',
-        r'\blow\b',
-    ]
-
-    # Check for high priority first (more specific)
-    for pattern in high_priority_patterns:
-        if re.search(pattern, text_lower):
-            return "high"
-
-    # Check for low priority
-    for pattern in low_priority_patterns:
-        if re.search(pattern, text_lower):
-            return "low"
-
-    # Check for medium/normal priority patterns
-    if re.search(r'\bmedium\b|\bnormal\b', text_lower):
-        return "medium"
+    # High priority wins when both tiers match (precedence rule)
+    if _HIGH_PRIORITY_RE.search(text_lower):
+        return "high"
+
+    if _LOW_PRIORITY_RE.search(text_lower):
+        return "low"
 
     # Default to medium if no pattern matches
     return "medium"
@@ -21,6 +21,45 @@ from agents.model_settings import ModelSettings
 from .factory import create_model
 
 
+# Environment variables the MCP server subprocess actually needs.
+# Passing a curated allow-list instead of os.environ.copy() keeps the
+# spawn small and avoids leaking unrelated secrets (LLM API keys, etc.)
+# into the tool process, which only talks to the database.
+MCP_ENV_ALLOWLIST = (
+    # System basics the interpreter and libraries expect
+    "PATH",
+    "HOME",
+    "LANG",
+    "LC_ALL",
+    "TMPDIR",
+    "SYSTEMROOT",  # Windows
+    # App configuration used by mcp_server and TaskService
+    "DATABASE_URL",
+    "BETTER_AUTH_SECRET",
+    "MCP_SERVER_NAME",
+)
+
+
+def _mcp_subprocess_env(src_dir: Path) -> dict[str, str]:
+    """
+    Build the environment dict for the MCP server subprocess.
+
+    Args:
+        src_dir: Backend src directory to prepend to PYTHONPATH so the
+            subprocess can import src.* modules
+
+    Returns:
+        dict[str, str]: Allow-listed environment plus PYTHONPATH
+    """
+    env = {k: os.environ[k] for k in MCP_ENV_ALLOWLIST if k in os.environ}
+    current_pythonpath = os.environ.get("PYTHONPATH", "")
+    if current_pythonpath:
+        env["PYTHONPATH"] = f"{src_dir}:{current_pythonpath}"
+    else:
+        env["PYTHONPATH"] = str(src_dir)
+    return env
+
+
 # Agent Instructions - comprehensive guidelines for task management
 AGENT_INSTRUCTIONS = """
 You are a helpful task management assistant. Your role is to help users manage their todo lists through natural conversation.
@@ -90,11 +129,8 @@ CRITICAL: You will receive the user_id in a system message at the start of each
    - Always confirm the due date in your response so user knows when it's set
 
 1b. **Priority Handling**
-   - AUTOMATIC DETECTION: add_task automatically detects priority from keywords like:
-     * High priority: "high", "urgent", "critical", "important", "ASAP"
-     * Low priority: "low", "minor", "optional", "when you have time"
-     * Medium priority: Default if no keywords found
-   - EXPLICIT SETTING: If user explicitly specifies priority (e.g., "high priority task"), it's included in the detection
+   - AUTOMATIC DETECTION: add_task detects priority from the task text itself (keyword scan happens in the tool, not here) - do NOT analyze urgency yourself; just pass the user's wording through
+   - EXPLICIT SETTING: If user explicitly specifies a priority, pass it as the priority argument
    - PRIORITY UPDATES: Use set_priority to change a task's priority after creation
      * Example: "Make task 5 high priority" → set_priority(user_id, 5, "high")
    - PRIORITY FILTERING: Use list_tasks_by_priority to show tasks by priority
@@ -264,14 +300,9 @@ class TodoAgent:
         backend_dir = Path(__file__).parent.parent.parent  # src/agent_config -> src -> backend
         src_dir = backend_dir / "src"
 
-        # Create environment with PYTHONPATH set to include src directory
-        env = os.environ.copy()
-        # Add src directory to PYTHONPATH so mcp_server can import from src.*
-        current_pythonpath = env.get("PYTHONPATH", "")
-        if current_pythonpath:
-            env["PYTHONPATH"] = f"{src_dir}:{current_pythonpath}"
-        else:
-            env["PYTHONPATH"] = str(src_dir)
+        # Curated environment with PYTHONPATH set to include src directory
+        # so mcp_server can import from src.*
+        env = _mcp_subprocess_env(src_dir)
 
         # CRITICAL FIX: Use venv python3 directly instead of 'uv run python'
         # The MCP server requires packages from the UV virtual environment
@@ -7,6 +7,7 @@ protocol requests, including message streaming and widget rendering.
 Reference: reference-phase3/backend/routers/chatkit.py
 """
 
+import asyncio
 import logging
 from fastapi import APIRouter, Request, Depends
 from fastapi.responses import Response, StreamingResponse, JSONResponse
@@ -33,6 +34,7 @@ router = APIRouter(tags=["chatkit"])
 
 # ChatKit server will be initialized on first request
 _chatkit_server = None
+_chatkit_server_lock = asyncio.Lock()
 
 
 def get_current_user_info(user_id: str = Depends(get_current_user_id)) -> dict:
@@ -52,40 +54,48 @@ def get_current_user_info(user_id: str = Depends(get_current_user_id)) -> dict:
 
 
 async def _get_chatkit_server():
-    """Get or create the global ChatKit server instance."""
+    """Get or create the global ChatKit server instance.
+
+    Construction awaits the session factory, so two concurrent first
+    requests could both pass a bare None check and each build a server
+    (spawning an MCP subprocess apiece). The lock plus re-check makes
+    initialization happen exactly once.
+    """
     global _chatkit_server
 
     if _chatkit_server is None:
-        # TEMPORARY: Force MemoryStore to debug message display issue
-        # Set USE_MEMORY_STORE=1 to use in-memory store
-        import os
-        use_memory_store = os.environ.get("USE_MEMORY_STORE", "0") == "1"
-
-        if use_memory_store:
-            logger.info("Using MemoryStore (USE_MEMORY_STORE=1)")
-            from ...services.chatkit_store import MemoryStore
-            store = MemoryStore()
-        else:
-            try:
-                # Create database store with async session factory
-                # Import here to avoid circular dependencies
-                from ...db.async_session import get_session_factory
-
-                factory = await get_session_factory()
-                if factory is None:
-                    logger.warning("Session factory is None, using in-memory store")
+        async with _chatkit_server_lock:
+            if _chatkit_server is None:
+                # TEMPORARY: Force MemoryStore to debug message display issue
+                # Set USE_MEMORY_STORE=1 to use in-memory store
+                import os
+                use_memory_store = os.environ.get("USE_MEMORY_STORE", "0") == "1"
+
+                if use_memory_store:
+                    logger.info("Using MemoryStore (USE_MEMORY_STORE=1)")
                     from ...services.chatkit_store import MemoryStore
                     store = MemoryStore()
                 else:
-                    from ...services.chatkit_store import DatabaseStore
-                    store = DatabaseStore(factory)
-                    logger.info("Initialized ChatKit server with DatabaseStore for persistent storage")
-            except Exception as e:
-                logger.warning(f"Failed to initialize DatabaseStore: {e}, falling back to MemoryStore")
-                from ...services.chatkit_store import MemoryStore
-                store = MemoryStore()
-
-        _chatkit_server = TaskChatKitServer(store)
+                    try:
+                        # Create database store with async session factory
+                        # Import here to avoid circular dependencies
+                        from ...db.async_session import get_session_factory
+
+                        factory = await get_session_factory()
+                        if factory is None:
+                            logger.warning("Session factory is None, using in-memory store")
+                            from ...services.chatkit_store import MemoryStore
+                            store = MemoryStore()
+                        else:
+                            from ...services.chatkit_store import DatabaseStore
+                            store = DatabaseStore(factory)
+                            logger.info("Initialized ChatKit server with DatabaseStore for persistent storage")
+                    except Exception as e:
+                        logger.warning(f"Failed to initialize DatabaseStore: {e}, falling back to MemoryStore")
+                        from ...services.chatkit_store import MemoryStore
+                        store = MemoryStore()
+
+                _chatkit_server = TaskChatKitServer(store)
 
     return _chatkit_server
 
@@ -1270,23 +1270,20 @@ async def skip_task(
         if user_id != current_user_id:
             raise UnauthorizedError("Not authorized to access this resource")
 
-        task = TaskService.get_task_by_id(
+        # Service resolves the task itself (single user-scoped lookup)
+        result = RecurringService.skip_occurrence_by_id(
             session=session,
             task_id=task_id,
             user_id=current_user_id
         )
 
-        if task is None:
+        if result is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Task not found"
             )
 
-        skipped_task, next_occurrence = RecurringService.skip_occurrence(
-            session=session,
-            task=task,
-            user_id=current_user_id
-        )
+        skipped_task, next_occurrence = result
 
         complete_response = CompleteTaskResponse(
             completed_task=skipped_task,
@@ -1338,24 +1335,19 @@ async def stop_task_recurrence(
         if user_id != current_user_id:
             raise UnauthorizedError("Not authorized to access this resource")
 
-        task = TaskService.get_task_by_id(
+        # Single UPDATE ... RETURNING combines ownership check and write
+        updated_task = RecurringService.stop_recurrence_by_id(
             session=session,
             task_id=task_id,
             user_id=current_user_id
         )
 
-        if task is None:
+        if updated_task is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Task not found"
             )
 
-        updated_task = RecurringService.stop_recurrence(
-            session=session,
-            task=task,
-            user_id=current_user_id
-        )
-
         logger.info(f"User {current_user_id} stopped recurrence for task {task_id}")
 
         return TaskUpdateResponse(data=updated_task, error=None)
@@ -13,6 +13,7 @@ Security:
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from starlette.concurrency import run_in_threadpool
 from typing import Dict, Any
 from .jwt import verify_jwt_token, extract_user_id
 
@@ -25,8 +26,13 @@ security = HTTPBearer(
     auto_error=True  # Automatically raise 401 if Authorization header is missing
 )
 
+# Tokens up to this size verify fast enough to run inline on the event loop.
+# Better Auth tokens are well under this; anything larger is suspicious and
+# gets dispatched to the threadpool so the HMAC work can't stall the loop.
+_INLINE_VERIFY_MAX_TOKEN_CHARS = 2048
 
-def get_current_user(
+
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> Dict[str, Any]:
     """
@@ -60,7 +66,13 @@ def get_current_user(
         token = credentials.credentials
 
         # Verify JWT signature and decode payload
-        payload = verify_jwt_token(token)
+        # Normal-sized tokens verify inline (avoids threadpool dispatch
+        # overhead); oversized ones go to the threadpool to keep the event
+        # loop responsive during the longer HMAC computation
+        if len(token) < _INLINE_VERIFY_MAX_TOKEN_CHARS:
+            payload = verify_jwt_token(token)
+        else:
+            payload = await run_in_threadpool(verify_jwt_token, token)
 
         return payload
 
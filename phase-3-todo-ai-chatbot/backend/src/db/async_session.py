@@ -9,14 +9,21 @@ Reference: openai-agents-mcp-integration skill section 5.1
 import asyncio
 import logging
 import os
+import random
+import re
+import weakref
 from pathlib import Path
 from typing import AsyncIterator, Callable, TypeVar
 
 from dotenv import load_dotenv
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.exc import OperationalError, DBAPIError
 
+from ..models.message import Message
+
 # Load environment variables from .env file first (if it exists)
 # This is critical for MCP server subprocess which needs dotenv loaded
 env_path = Path(__file__).parent.parent.parent / ".env"
@@ -28,6 +35,12 @@ logger = logging.getLogger(__name__)
 # Type variable for retry decorator
 T = TypeVar('T')
 
+# Precompiled patterns for stripping the sslmode query parameter from the
+# DATABASE_URL (asyncpg takes ssl via connect_args, not the URL)
+_SSLMODE_PARAM_RE = re.compile(r'[?&]sslmode=[^&]*')
+_ORPHAN_QUERY_SEP_RE = re.compile(r'\?&')
+_TRAILING_QUERY_SEP_RE = re.compile(r'[?&]$')
+
 # Get database URL and convert to async format
 DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
@@ -45,11 +58,10 @@ if DATABASE_URL.startswith("postgresql://") or DATABASE_URL.startswith("postgres
     # Remove sslmode from URL to prevent "unexpected keyword argument 'sslmode'" error
     if "sslmode=" in async_database_url:
         # Remove sslmode parameter (e.g., ?sslmode=require or &sslmode=require)
-        import re
-        async_database_url = re.sub(r'[?&]sslmode=[^&]*', '', async_database_url)
+        async_database_url = _SSLMODE_PARAM_RE.sub('', async_database_url)
         # Clean up any resulting double ? or & or trailing separators
-        async_database_url = re.sub(r'\?&', '?', async_database_url)
-        async_database_url = re.sub(r'[?&]$', '', async_database_url)
+        async_database_url = _ORPHAN_QUERY_SEP_RE.sub('?', async_database_url)
+        async_database_url = _TRAILING_QUERY_SEP_RE.sub('', async_database_url)
 
 elif DATABASE_URL.startswith("sqlite://"):
     # For testing: convert sqlite:// to sqlite+aiosqlite://
@@ -59,18 +71,37 @@ else:
 
 # Lazy initialization of async engine
 _async_engine = None
-_async_engine_lock = asyncio.Lock()
+
+# Init locks are created per event loop on first use. A module-level
+# asyncio.Lock() would bind to whichever loop imported this module first and
+# raise "attached to a different loop" under multi-loop test runners or
+# worker restarts. WeakKeyDictionary lets locks die with their loop.
+_init_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_init_lock() -> asyncio.Lock:
+    """Return the init lock for the running event loop, creating it lazily."""
+    loop = asyncio.get_running_loop()
+    lock = _init_locks.get(loop)
+    if lock is None:
+        lock = _init_locks.setdefault(loop, asyncio.Lock())
+    return lock
+
 
 async def _get_async_engine():
     """Lazy initialization of async database engine - only connects when first used."""
     global _async_engine
-    if _async_engine is None:
-        async with _async_engine_lock:
-            if _async_engine is None:
-                _async_engine = _create_async_engine()
+    if _async_engine is not None:
+        # Unlocked fast path: singleton already built, skip lock acquisition
+        return _async_engine
+    async with _get_init_lock():
+        if _async_engine is None:
+            _async_engine = _create_async_engine()
     return _async_engine
 
-def _create_async_engine():
+def _create_async_engine(pool_size_override: int | None = None):
     """Create the async database engine based on database type."""
     if DATABASE_URL.startswith("sqlite://"):
         from sqlmodel.pool import StaticPool
@@ -81,36 +112,151 @@ def _create_async_engine():
             echo=False,
         )
     else:
-        # Use minimal pool settings for serverless PostgreSQL
+        # Serverless platforms keep the conservative single-connection pool
+        # (connections don't survive the instance anyway); everywhere else
+        # the pool is tunable via env so concurrent chats aren't serialized
+        # through one asyncpg connection
+        if os.getenv("VERCEL") or os.getenv("AWS_LAMBDA_FUNCTION_NAME"):
+            pool_size, max_overflow, pool_timeout = 1, 0, 30
+        else:
+            pool_size = int(os.getenv("DB_POOL_SIZE", "5"))
+            max_overflow = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+            pool_timeout = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+        if pool_size_override is not None:
+            pool_size = pool_size_override
+
         # Note: asyncpg uses ssl='require' instead of sslmode='require'
+        # No pool_pre_ping: it costs a SELECT 1 round-trip on every checkout.
+        # TCP keepalives surface dead connections at the socket level instead,
+        # pool_recycle bounds connection age, and the rare stale connection
+        # that slips through is handled by the execute_with_retry path.
         return create_async_engine(
             async_database_url,
-            pool_size=1,              # Minimal pool to avoid connection issues
-            max_overflow=0,           # No overflow connections
-            pool_pre_ping=True,       # Verify connections before use
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
             pool_recycle=300,         # Recycle connections every 5 minutes
             echo=False,               # Set to True for debugging
-            connect_args={"ssl": "require"},  # asyncpg uses ssl='require'
+            connect_args={
+                "ssl": "require",              # asyncpg uses ssl='require'
+                "statement_cache_size": 1024,  # Cache prepared statements so Postgres skips parse/plan
+                # SQLAlchemy's own asyncpg adapter keeps a separate cache for
+                # statements it prepares explicitly; the default of 100 is
+                # small for the app's statement variety
+                "prepared_statement_cache_size": 500,
+                "server_settings": {
+                    "tcp_keepalives_idle": "30",
+                    "tcp_keepalives_interval": "10",
+                    # JIT compilation only pays off for long analytical
+                    # queries; for this app's short OLTP statements it adds
+                    # planning latency, so turn it off per connection
+                    "jit": "off",
+                },
+            },
         )
 
 # Lazy session factory
-_async_session_factory = None
+_async_session_factory: async_sessionmaker[AsyncSession] | None = None
 
 async def _get_session_factory():
     """Lazy initialization of async session factory."""
     global _async_session_factory
-    if _async_session_factory is None:
-        engine = await _get_async_engine()
-        _async_session_factory = sessionmaker(
-            engine,
-            class_=AsyncSession,
-            expire_on_commit=False,
-            autoflush=False,
-            autocommit=False,
-        )
+    if _async_session_factory is not None:
+        return _async_session_factory
+    # Resolve the engine before taking the lock (asyncio.Lock is not
+    # re-entrant and _get_async_engine uses the same per-loop lock)
+    engine = await _get_async_engine()
+    async with _get_init_lock():
+        if _async_session_factory is None:
+            # async_sessionmaker is the purpose-built 2.x factory; the
+            # legacy sessionmaker(class_=AsyncSession) goes through a
+            # sync-compat shim on every factory() call
+            _async_session_factory = async_sessionmaker(
+                engine,
+                expire_on_commit=False,
+                autoflush=False,
+            )
     return _async_session_factory
 
 
+async def _autosize_pool() -> int | None:
+    """
+    Derive a pool size from the server's max_connections setting.
+
+    Runs SHOW max_connections through a single-connection bootstrap
+    engine, then sizes the pool to a configurable fraction of the server
+    limit (DB_POOL_FRACTION, default 0.4) split across app replicas
+    (APP_REPLICAS, default 1). Avoids both "too many clients" errors at
+    peak and under-utilization at low load.
+
+    Returns:
+        Computed pool size, or None if the probe fails
+    """
+    from sqlalchemy import text
+
+    bootstrap = create_async_engine(
+        async_database_url,
+        pool_size=1,
+        max_overflow=0,
+        connect_args={"ssl": "require"},
+    )
+    try:
+        async with bootstrap.connect() as conn:
+            max_connections = (
+                await conn.execute(text("SHOW max_connections"))
+            ).scalar_one()
+        fraction = float(os.getenv("DB_POOL_FRACTION", "0.4"))
+        replicas = int(os.getenv("APP_REPLICAS", "1"))
+        return max(1, int(int(max_connections) * fraction / replicas))
+    except Exception as e:
+        logger.warning(f"Could not auto-size pool from max_connections: {e}")
+        return None
+    finally:
+        await bootstrap.dispose()
+
+
+async def init_async_db() -> None:
+    """
+    Eagerly initialize the async engine and session factory.
+
+    Called from the FastAPI lifespan handler so per-request session
+    creation is a plain factory call with no locks or init awaits on the
+    hot path. On PostgreSQL (non-serverless), probes the server's
+    max_connections first and sizes the pool accordingly; falls back to
+    the env-configured defaults if the probe fails. Safe to call more
+    than once.
+    """
+    global _async_engine
+    if (
+        _async_engine is None
+        and async_database_url.startswith("postgresql+asyncpg://")
+        and not (os.getenv("VERCEL") or os.getenv("AWS_LAMBDA_FUNCTION_NAME"))
+        and not os.getenv("DB_POOL_SIZE")  # explicit setting wins over probe
+    ):
+        target = await _autosize_pool()
+        if target is not None:
+            _async_engine = _create_async_engine(pool_size_override=target)
+            logger.info(f"Auto-sized async pool to {target} connections")
+
+    await _get_session_factory()
+    logger.info("Async database engine and session factory initialized")
+
+
+async def dispose_async_db() -> None:
+    """
+    Dispose the async engine and reset the cached singletons.
+
+    Called from the FastAPI lifespan handler on shutdown so pooled
+    connections are closed cleanly.
+    """
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _async_session_factory = None
+
+
 async def get_async_session() -> AsyncIterator[AsyncSession]:
     """
     Dependency for FastAPI endpoints requiring async database access.
@@ -125,7 +271,14 @@ async def get_async_session() -> AsyncIterator[AsyncSession]:
         ):
             ...
     """
-    factory = await _get_session_factory()
+    # Hot path: the lifespan handler has already built the factory, so this
+    # is a plain attribute read. The lazy call only runs in non-app contexts
+    # (MCP subprocess, scripts) that skip the lifespan.
+    factory = _async_session_factory
+    if factory is None:
+        factory = await _get_session_factory()
+    # No explicit close: the async-with block already closes the session on
+    # exit, so a finally-close would just be a second await on every request.
     async with factory() as session:
         try:
             yield session
@@ -133,8 +286,6 @@ async def get_async_session() -> AsyncIterator[AsyncSession]:
         except Exception:
             await session.rollback()
             raise
-        finally:
-            await session.close()
 
 
 # Export engine for alembic migrations and other use cases
@@ -152,10 +303,40 @@ async def get_session_factory():
 
 
 # T105: Database retry logic with exponential backoff
+
+# Retryable SQLSTATE classes reported by asyncpg: 08xxx connection errors,
+# 40001/40P01 serialization failure & deadlock, 57P03 cannot_connect_now,
+# 53300 too_many_connections
+_RETRYABLE_SQLSTATES = frozenset({
+    "08000", "08001", "08003", "08004", "08006", "08007",
+    "40001", "40P01", "57P03", "53300",
+})
+
+# Substring fallback for drivers that don't expose a SQLSTATE
+_RETRY_KEYWORDS = ("connection", "timeout", "deadlock", "pool", "closed")
+
+
+def _is_retryable_error(e: Exception) -> bool:
+    """
+    Classify a DB error as transient (retryable) or permanent.
+
+    Prefers the driver's SQLSTATE code (asyncpg exposes it on e.orig),
+    which is constant-time and doesn't misclassify benign messages;
+    falls back to keyword sniffing when no SQLSTATE is available.
+    """
+    sqlstate = getattr(getattr(e, "orig", None), "sqlstate", None)
+    if sqlstate is not None:
+        return sqlstate in _RETRYABLE_SQLSTATES
+    error_msg = str(e).lower()
+    return any(keyword in error_msg for keyword in _RETRY_KEYWORDS)
+
+
+
 async def execute_with_retry(
     operation: Callable[[], T],
     max_attempts: int = 3,
-    initial_delay: float = 1.0
+    initial_delay: float = 1.0,
+    max_delay: float = 30.0
 ) -> T:
     """
     Execute database operation with exponential backoff retry logic.
@@ -163,10 +344,16 @@ async def execute_with_retry(
     Retries on transient errors (connection issues, timeouts, deadlocks).
     Does NOT retry on permanent errors (constraint violations, data errors).
 
+    Delays use "full jitter": each wait is drawn uniformly from
+    [0, min(max_delay, initial_delay * 2**attempt)] so concurrent callers
+    hitting the same transient failure don't retry in lockstep and hammer
+    an already-stressed database.
+
     Args:
         operation: Async callable to execute
         max_attempts: Maximum retry attempts (default: 3)
-        initial_delay: Initial delay in seconds (default: 1.0)
+        initial_delay: Base delay in seconds for the backoff curve (default: 1.0)
+        max_delay: Cap on the backoff ceiling in seconds (default: 30.0)
 
     Returns:
         Result of operation
@@ -184,29 +371,60 @@ async def execute_with_retry(
 
         message = await execute_with_retry(create_message)
     """
-    delays = [initial_delay * (2 ** i) for i in range(max_attempts)]  # [1s, 2s, 4s]
-
     for attempt in range(max_attempts):
         try:
             return await operation()
         except (OperationalError, DBAPIError) as e:
-            # Check if error is retryable (connection, timeout, deadlock)
-            error_msg = str(e).lower()
-            is_retryable = any(
-                keyword in error_msg
-                for keyword in ["connection", "timeout", "deadlock", "pool", "closed"]
-            )
+            # Check if error is retryable (SQLSTATE whitelist, keyword fallback)
+            is_retryable = _is_retryable_error(e)
 
             if not is_retryable or attempt >= max_attempts - 1:
                 # Non-retryable error or final attempt - reraise
                 logger.error(f"Database operation failed after {attempt + 1} attempts: {e}")
                 raise
 
-            # Retryable error - wait and retry
-            delay = delays[attempt]
+            # Retryable error - wait and retry with full jitter
+            delay = random.uniform(0, min(max_delay, initial_delay * (2 ** attempt)))
             logger.warning(
                 f"Database operation failed (attempt {attempt + 1}/{max_attempts}), "
                 f"retrying in {delay}s: {e}"
             )
             await asyncio.sleep(delay)
             continue
+
+
+async def bulk_insert_messages(session: AsyncSession, rows: list[dict]) -> int:
+    """
+    Insert a batch of message rows in a single round-trip.
+
+    Streaming chat responses persist one Message per item; inserting each
+    through session.add() + commit() pays a full round-trip per row. This
+    helper collapses the batch into one INSERT with ON CONFLICT DO NOTHING,
+    so replayed items (same primary key) are silently skipped instead of
+    erroring - callers can accumulate rows during a stream and flush at
+    chunk boundaries or on stream end.
+
+    Rows must carry every column the dialect has no server default for
+    (on SQLite that includes id and expires_at).
+
+    Args:
+        session: Async database session
+        rows: List of column dicts for the messages table
+
+    Returns:
+        int: Number of rows sent (conflicting rows are skipped by the DB)
+    """
+    if not rows:
+        return 0
+
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        stmt = pg_insert(Message).values(rows).on_conflict_do_nothing()
+    elif dialect == "sqlite":
+        stmt = sqlite_insert(Message).values(rows).on_conflict_do_nothing()
+    else:
+        stmt = insert(Message).values(rows)
+
+    await session.execute(stmt)
+    await session.commit()
+    return len(rows)
@@ -9,6 +9,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 from uuid import UUID, uuid4
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
@@ -37,9 +38,15 @@ class Conversation(SQLModel, table=True):
         - user_id: Fast lookup of user's conversations
         - created_at DESC: Fast FIFO cleanup
         - (user_id, created_at DESC): Optimized sorted user conversation queries
+        - (user_id, updated_at): Thread listing ordered by recency (scanned
+          backwards for the ORDER BY updated_at DESC in load_threads)
     """
     __tablename__ = "conversations"
 
+    __table_args__ = (
+        Index("ix_conversations_user_updated", "user_id", "updated_at"),
+    )
+
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     user_id: str = Field(nullable=False, index=True)
     thread_id: str = Field(nullable=False, unique=True, index=True)  # ChatKit thread identifier
@@ -5,12 +5,13 @@ Implements 2-day retention policy and user message length validation.
 
 Reference: openai-agents-mcp-integration skill section 5.2
 """
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING, Optional
 from uuid import UUID, uuid4
 
 from enum import Enum
-from sqlalchemy import JSON, Column
+from sqlalchemy import JSON, Column, DateTime, Enum as SAEnum, Index, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
@@ -32,7 +33,7 @@ class Message(SQLModel, table=True):
         chatkit_item_id: Original ChatKit item ID (preserved for frontend consistency)
         conversation_id: Parent conversation (foreign key, indexed)
         user_id: Message owner (denormalized for user isolation queries)
-        role: Message sender role ("user", "assistant", or "system" string)
+        role: Message sender role (MessageRole enum, native PG ENUM in the database)
         content: Message text content (max 2000 chars for user, unlimited for assistant)
         tool_calls: JSON array of MCP tool invocations (assistant messages only, for debugging/replay)
         created_at: Message creation timestamp (indexed for retention cleanup)
@@ -44,16 +45,63 @@ class Message(SQLModel, table=True):
         - Assistant messages unlimited (AI may generate long explanations)
         - Messages expire after 2 days (expires_at field)
         - Cascade-deleted when parent conversation deleted
-        - role is a string (not enum) matching database schema
+        - role is a MessageRole enum (str-valued, so string comparisons still work)
         - chatkit_item_id preserves the original ChatKit item ID for frontend consistency
 
     Indexes:
-        - conversation_id: Fast filtering by conversation
-        - created_at: Fast retention cleanup
-        - (conversation_id, created_at): Optimized chronological loading (most common query)
+        - (conversation_id, created_at) INCLUDE (role, content, chatkit_item_id,
+          user_id): index-only chronological loading (most common query); its
+          prefix also covers plain conversation_id lookups
+        - expires_at (BRIN): Fast retention cleanup via block-range scan
+        - user_id: User isolation queries
+        - chatkit_item_id: get_item lookups in the ChatKit store (a read path,
+          not just write-time dedup, so it cannot be demoted to a UNIQUE
+          constraint - which the partitioned table couldn't host anyway
+          without including created_at)
+
+    Storage:
+        role is a fixed-width native ENUM (4 bytes); a smallint would shave
+        2 more bytes/row but at the cost of opaque values and a mapping shim
+        for the string-based ChatKit protocol layer - not worth it.
     """
     __tablename__ = "messages"
 
+    # BRIN suits expires_at: inserts are time-ordered so block ranges stay
+    # tightly correlated, and the retention sweep (WHERE expires_at < now())
+    # becomes a cheap range scan instead of walking a full B-tree. BRIN is
+    # also ~1000x smaller than a B-tree, cutting write amplification on the
+    # hot chat-insert path. On SQLite this degrades to a plain index.
+    # The composite (conversation_id, created_at) serves both "filter by
+    # conversation" and "load chronologically" - the single-column B-trees on
+    # conversation_id and created_at were pure write overhead on every
+    # chat-token insert, so only the composite is declared.
+    # On Postgres the table is range-partitioned by created_at (daily
+    # partitions, see migration f7c4b9e02a61) so retention can DROP whole
+    # partitions instead of deleting rows; SQLite ignores the option and the
+    # composite PK simply includes created_at.
+    __table_args__ = (
+        # Covering index for the chat-replay query ("last N messages for
+        # conversation X ordered by created_at"): INCLUDE carries the
+        # payload columns - user_id included so the store's isolation
+        # filter doesn't force heap fetches - and an index-only scan
+        # answers the whole query. fillfactor leaves headroom for the
+        # append-heavy insert pattern; SQLite ignores both options.
+        Index(
+            "ix_messages_conv_created_covering",
+            "conversation_id",
+            "created_at",
+            postgresql_include=["role", "content", "chatkit_item_id", "user_id"],
+            postgresql_with={"fillfactor": 90},
+        ),
+        Index(
+            "ix_messages_expires_at_brin",
+            "expires_at",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     chatkit_item_id: str = Field(
         nullable=False,
@@ -63,21 +111,52 @@ class Message(SQLModel, table=True):
     conversation_id: UUID = Field(
         foreign_key="conversations.id",
         nullable=False,
-        index=True
     )
     user_id: str = Field(nullable=False, index=True)  # User isolation field
-    role: str = Field(nullable=False)  # "user" | "assistant" | "system" (string, not enum)
+    # Stored as a native PG ENUM (message_role): 4 bytes/row vs variable-length
+    # text, smaller indexes. values_callable keeps the stored values lowercase
+    # ("user"/"assistant"/"system") to match pre-migration rows; on SQLite this
+    # renders as VARCHAR + CHECK so the test backend is unaffected.
+    role: MessageRole = Field(
+        sa_column=Column(
+            SAEnum(
+                MessageRole,
+                name="message_role",
+                native_enum=True,
+                values_callable=lambda e: [m.value for m in e],
+            ),
+            nullable=False,
+        )
+    )
     content: str = Field(nullable=False)
-    tool_calls: Optional[dict] = Field(default=None, sa_column=Column(JSON))  # MCP tool invocations (assistant only)
+    # JSONB on Postgres (binary storage, no reparse on read - matches what
+    # migration c8748918d4f7 actually created); plain JSON elsewhere.
+    tool_calls: Optional[dict] = Field(
+        default=None,
+        sa_column=Column(JSON().with_variant(JSONB(), "postgresql")),
+    )  # MCP tool invocations (assistant only)
+    # Timestamps are timestamptz with DB-side defaults (now() / now() + 2 days,
+    # see migrations 002_add_chat_tables and 407432637c3c) so Core/bulk inserts
+    # that omit these columns get monotonic server clocks for free. The Python
+    # factories remain as a portable fallback for plain model construction
+    # (expires_at's interval default is Postgres-only and not valid SQLite DDL).
+    # Part of the composite PK: Postgres requires the partition key in any
+    # unique constraint on a partitioned table.
     created_at: datetime = Field(
         default_factory=datetime.utcnow,
-        nullable=False,
-        index=True
+        sa_column=Column(
+            DateTime(timezone=True),
+            primary_key=True,
+            nullable=False,
+            server_default=func.now(),
+        ),
     )
     expires_at: datetime = Field(
         default_factory=lambda: datetime.utcnow() + timedelta(days=2),
-        nullable=False,
-        index=True
+        sa_column=Column(
+            DateTime(timezone=True),
+            nullable=False,
+        ),
     )
 
     # Relationships
@@ -86,14 +165,18 @@ class Message(SQLModel, table=True):
     @property
     def is_user_message(self) -> bool:
         """Check if message is from user."""
-        return self.role == "user"
+        return self.role == MessageRole.USER
 
     @property
     def is_assistant_message(self) -> bool:
         """Check if message is from assistant."""
-        return self.role == "assistant"
+        return self.role == MessageRole.ASSISTANT
 
     @property
     def is_expired(self) -> bool:
         """Check if message has expired (older than 2 days)."""
+        # Rows loaded from timestamptz columns carry tzinfo; factory-built
+        # instances are naive UTC. Compare like with like to avoid TypeError.
+        if self.expires_at.tzinfo is not None:
+            return datetime.now(timezone.utc) > self.expires_at
         return datetime.utcnow() > self.expires_at
@@ -4,7 +4,7 @@ Defines the database schema for tasks with user isolation and proper validation.
 """
 
 from sqlmodel import SQLModel, Field, Index, Relationship
-from sqlalchemy import Column, String, Boolean, ForeignKey
+from sqlalchemy import Column, String, Boolean, ForeignKey, text
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from datetime import datetime, date
 from typing import Optional, List, TYPE_CHECKING
@@ -75,14 +75,34 @@ class Task(TaskBase, TimestampMixin, table=True):
     - Index on user_id for user-scoped queries
     - Index on created_at for sorting operations
     - Composite index on (user_id, completed) for filtered queries
-    - Index on parent_task_id for recurring task instance lookups
+    - Partial index on (parent_task_id, completed, due_date) WHERE
+      parent_task_id IS NOT NULL for recurring-series lookups and bulk
+      series updates; tiny because most rows have no parent
+    - Composite indexes on (user_id, completed, updated_at),
+      (user_id, parent_task_id, completed), and (user_id, created_at) so
+      the analytics queries (heatmap, recurring stats, streak, date-range
+      stats) run as index range scans instead of per-user full scans;
+      (user_id, priority) is covered by ix_tasks_user_priority from the
+      priority migration
     """
     __tablename__ = "tasks"
     __table_args__ = (
         Index("ix_tasks_user_id_completed", "user_id", "completed"),
-        Index("ix_tasks_parent_task_id", "parent_task_id"),
+        # Replaces the old single-column parent_task_id index (same prefix);
+        # the WHERE clause keeps it tiny since most tasks have no parent.
+        # SQLite ignores the partial predicate's dialect option.
+        Index(
+            "ix_tasks_parent_completed_due",
+            "parent_task_id",
+            "completed",
+            "due_date",
+            postgresql_where=text("parent_task_id IS NOT NULL"),
+        ),
         Index("ix_tasks_user_id_is_recurring", "user_id", "is_recurring"),
         Index("ix_tasks_is_pattern", "is_pattern", "user_id"),
+        Index("ix_tasks_user_completed_updated", "user_id", "completed", "updated_at"),
+        Index("ix_tasks_user_parent_completed", "user_id", "parent_task_id", "completed"),
+        Index("ix_tasks_user_created", "user_id", "created_at"),
     )
 
     # Primary key for the task (UUID)
@@ -124,6 +144,10 @@ class Task(TaskBase, TimestampMixin, table=True):
         max_length=27,
         description="Days for weekly recurrence: 'mon,wed,fri' (comma-separated)"
     )
+    recurrence_days_mask: Optional[int] = Field(
+        default=None,
+        description="Denormalized 7-bit weekday mask of recurrence_days (bit 0 = Monday), kept in sync at write time so read paths skip string parsing"
+    )
     recurrence_end_date: Optional[date] = Field(
         default=None,
         description="Optional end date for recurrence"
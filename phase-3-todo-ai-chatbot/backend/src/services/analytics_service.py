@@ -1,303 +1,480 @@
-"""
-Analytics Service for Phase 4.
-
-Provides analytics and statistics for task data:
-- Completion stats (total, completed, completion rate)
-- Heatmap data (completions by day for a year)
-- Recurring task statistics
-- Priority distribution
-"""
-
-from datetime import date, datetime, timedelta
-from typing import Dict, List, Optional, Tuple
-from sqlmodel import Session, select, func
-from collections import defaultdict
-import logging
-
-from ..models.task import Task, PriorityType
-
-logger = logging.getLogger(__name__)
-
-
-class AnalyticsService:
-    """
-    Service class for analytics operations.
-
-    Provides methods for:
-    - Get completion stats for date range
-    - Generate heatmap data for a year
-    - Get recurring task statistics
-    - Get priority distribution
-    """
-
-    @staticmethod
-    def get_completion_stats(
-        session: Session,
-        user_id: str,
-        start_date: Optional[date] = None,
-        end_date: Optional[date] = None
-    ) -> Dict:
-        """
-        Get task completion statistics for a user within a date range.
-
-        Args:
-            session: Database session
-            user_id: User ID for filtering
-            start_date: Optional start date filter
-            end_date: Optional end date filter
-
-        Returns:
-            Dict with total, completed, pending, completion_rate, overdue
-        """
-        try:
-            # Base query for all tasks
-            base_query = select(Task).where(Task.user_id == user_id)
-
-            # Apply date filters on created_at
-            if start_date:
-                base_query = base_query.where(Task.created_at >= datetime.combine(start_date, datetime.min.time()))
-            if end_date:
-                base_query = base_query.where(Task.created_at <= datetime.combine(end_date, datetime.max.time()))
-
-            tasks = list(session.exec(base_query).all())
-
-            total = len(tasks)
-            completed = sum(1 for t in tasks if t.completed)
-            pending = total - completed
-            completion_rate = (completed / total * 100) if total > 0 else 0
-
-            # Count overdue tasks (not completed, due date in the past)
-            now = date.today()
-            overdue = sum(
-                1 for t in tasks
-                if not t.completed and t.due_date and t.due_date < now
-            )
-
-            logger.info(f"Retrieved completion stats for user {user_id}: {total} tasks")
-
-            return {
-                "total": total,
-                "completed": completed,
-                "pending": pending,
-                "completion_rate": round(completion_rate, 1),
-                "overdue": overdue,
-            }
-
-        except Exception as e:
-            logger.error(f"Error getting completion stats for user {user_id}: {e}")
-            raise
-
-    @staticmethod
-    def get_heatmap_data(
-        session: Session,
-        user_id: str,
-        year: int
-    ) -> List[Dict]:
-        """
-        Generate heatmap data showing completions per day for a year.
-
-        Args:
-            session: Database session
-            user_id: User ID for filtering
-            year: Year to generate data for
-
-        Returns:
-            List of {date: YYYY-MM-DD, count: int, level: 0-4}
-        """
-        try:
-            # Get start and end of year
-            year_start = date(year, 1, 1)
-            year_end = date(year, 12, 31)
-
-            # Query completed tasks in this year
-            query = select(Task).where(
-                (Task.user_id == user_id) &
-                (Task.completed == True) &
-                (Task.updated_at >= datetime.combine(year_start, datetime.min.time())) &
-                (Task.updated_at <= datetime.combine(year_end, datetime.max.time()))
-            )
-
-            tasks = list(session.exec(query).all())
-
-            # Count completions by day
-            completions_by_day = defaultdict(int)
-            for task in tasks:
-                if task.updated_at:
-                    day_key = task.updated_at.date().isoformat()
-                    completions_by_day[day_key] += 1
-
-            # Build heatmap data for entire year
-            heatmap_data = []
-            current_date = year_start
-            while current_date <= year_end:
-                day_str = current_date.isoformat()
-                count = completions_by_day.get(day_str, 0)
-
-                # Calculate level (0-4) based on count
-                if count == 0:
-                    level = 0
-                elif count == 1:
-                    level = 1
-                elif count <= 3:
-                    level = 2
-                elif count <= 5:
-                    level = 3
-                else:
-                    level = 4
-
-                heatmap_data.append({
-                    "date": day_str,
-                    "count": count,
-                    "level": level,
-                })
-
-                current_date += timedelta(days=1)
-
-            logger.info(f"Generated heatmap data for user {user_id}, year {year}")
-
-            return heatmap_data
-
-        except Exception as e:
-            logger.error(f"Error generating heatmap for user {user_id}: {e}")
-            raise
-
-    @staticmethod
-    def get_recurring_stats(
-        session: Session,
-        user_id: str
-    ) -> Dict:
-        """
-        Get statistics for recurring tasks.
-
-        Args:
-            session: Database session
-            user_id: User ID for filtering
-
-        Returns:
-            Dict with total_patterns, active_patterns, completion_rate, current_streak
-        """
-        try:
-            # Get all recurring patterns (parent tasks)
-            patterns_query = select(Task).where(
-                (Task.user_id == user_id) &
-                (Task.is_recurring == True) &
-                (Task.parent_task_id == None)
-            )
-            patterns = list(session.exec(patterns_query).all())
-
-            total_patterns = len(patterns)
-            active_patterns = sum(1 for p in patterns if not p.completed)
-
-            # Get all instances for completion rate
-            instances_query = select(Task).where(
-                (Task.user_id == user_id) &
-                (Task.parent_task_id != None)
-            )
-            instances = list(session.exec(instances_query).all())
-
-            instance_total = len(instances)
-            instance_completed = sum(1 for i in instances if i.completed)
-            completion_rate = (instance_completed / instance_total * 100) if instance_total > 0 else 0
-
-            # Calculate current streak (consecutive days with completed recurring tasks)
-            streak = AnalyticsService._calculate_streak(session, user_id)
-
-            logger.info(f"Retrieved recurring stats for user {user_id}")
-
-            return {
-                "total_patterns": total_patterns,
-                "active_patterns": active_patterns,
-                "total_instances": instance_total,
-                "completed_instances": instance_completed,
-                "completion_rate": round(completion_rate, 1),
-                "current_streak": streak,
-            }
-
-        except Exception as e:
-            logger.error(f"Error getting recurring stats for user {user_id}: {e}")
-            raise
-
-    @staticmethod
-    def _calculate_streak(session: Session, user_id: str) -> int:
-        """Calculate the current streak of consecutive days with completed recurring tasks."""
-        try:
-            # Get completed recurring instances ordered by completion date
-            query = select(Task).where(
-                (Task.user_id == user_id) &
-                (Task.completed == True) &
-                (Task.parent_task_id != None)
-            ).order_by(Task.updated_at.desc())
-
-            tasks = list(session.exec(query).all())
-
-            if not tasks:
-                return 0
-
-            # Group by day
-            days_with_completions = set()
-            for task in tasks:
-                if task.updated_at:
-                    days_with_completions.add(task.updated_at.date())
-
-            # Count consecutive days from today backwards
-            streak = 0
-            check_date = date.today()
-
-            # If today hasn't had any, start from yesterday
-            if check_date not in days_with_completions:
-                check_date -= timedelta(days=1)
-
-            while check_date in days_with_completions:
-                streak += 1
-                check_date -= timedelta(days=1)
-
-            return streak
-
-        except Exception as e:
-            logger.error(f"Error calculating streak for user {user_id}: {e}")
-            return 0
-
-    @staticmethod
-    def get_priority_distribution(
-        session: Session,
-        user_id: str,
-        start_date: Optional[date] = None,
-        end_date: Optional[date] = None
-    ) -> Dict:
-        """
-        Get task distribution by priority.
-
-        Args:
-            session: Database session
-            user_id: User ID for filtering
-            start_date: Optional start date filter
-            end_date: Optional end date filter
-
-        Returns:
-            Dict with High, Medium, Low counts and percentages
-        """
-        try:
-            base_query = select(Task).where(Task.user_id == user_id)
-
-            if start_date:
-                base_query = base_query.where(Task.created_at >= datetime.combine(start_date, datetime.min.time()))
-            if end_date:
-                base_query = base_query.where(Task.created_at <= datetime.combine(end_date, datetime.max.time()))
-
-            tasks = list(session.exec(base_query).all())
-
-            total = len(tasks)
-            high = sum(1 for t in tasks if t.priority == PriorityType.High)
-            medium = sum(1 for t in tasks if t.priority == PriorityType.Medium)
-            low = sum(1 for t in tasks if t.priority == PriorityType.Low)
-
-            return {
-                "total": total,
-                "high": {"count": high, "percentage": round(high / total * 100, 1) if total else 0},
-                "medium": {"count": medium, "percentage": round(medium / total * 100, 1) if total else 0},
-                "low": {"count": low, "percentage": round(low / total * 100, 1) if total else 0},
-            }
-
-        except Exception as e:
-            logger.error(f"Error getting priority distribution for user {user_id}: {e}")
-            raise
+"""
+Analytics Service for Phase 4.
+
+Provides analytics and statistics for task data:
+- Completion stats (total, completed, completion rate)
+- Heatmap data (completions by day for a year)
+- Recurring task statistics
+- Priority distribution
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import and_, case
+from sqlmodel import Session, select, func
+import logging
+import time
+
+from ..models.task import Task, PriorityType
+
+logger = logging.getLogger(__name__)
+
+# Day boundary times for datetime.combine, hoisted out of the request path
+_MIN_TIME = datetime.min.time()
+_MAX_TIME = datetime.max.time()
+
+# Heatmap intensity levels indexed by per-day completion count (capped at 6):
+# 0 -> 0, 1 -> 1, 2-3 -> 2, 4-5 -> 3, 6+ -> 4
+_LEVEL_LUT = (0, 1, 2, 2, 3, 3, 4)
+
+# Short-TTL in-process cache for analytics results. Dashboard reloads
+# re-request the same user/year repeatedly; a 60s TTL absorbs those bursts
+# while task writes call invalidate_user() so fresh completions show up
+# immediately. Keys are (<method>, user_id, ...params). Bounded: keys
+# include caller-supplied date ranges, so without a cap a client iterating
+# distinct ranges could grow the dict without limit.
+_ANALYTICS_CACHE_TTL_SECONDS = 60.0
+_ANALYTICS_CACHE_MAX_ENTRIES = 1024
+_analytics_cache: Dict[tuple, Tuple[float, Any]] = {}
+
+# Per-user "has any tasks" flag so the common empty state (every newly
+# signed-up user) short-circuits all four analytics methods with one
+# LIMIT 1 probe instead of four aggregate scans. True entries are pinned -
+# harmless if stale, they just mean the real query runs. False entries
+# carry the same 60s TTL as _analytics_cache: invalidate_user() evicts
+# them on the first task write in this process, but writes made through
+# the MCP tool-server subprocess never reach this process's cache, and a
+# pinned False would serve empty analytics until restart.
+_user_has_tasks: Dict[str, Tuple[float, bool]] = {}
+
+
+def _cache_get(key: tuple) -> Optional[Any]:
+    """Return a cached value if present and fresh, else None."""
+    entry = _analytics_cache.get(key)
+    if entry is None:
+        return None
+    cached_at, value = entry
+    if time.monotonic() - cached_at >= _ANALYTICS_CACHE_TTL_SECONDS:
+        _analytics_cache.pop(key, None)
+        return None
+    return value
+
+
+def _cache_put(key: tuple, value: Any) -> None:
+    """Store a value with the current timestamp, keeping the cache bounded.
+
+    When the cache is full, expired entries are swept first; if every
+    entry is still fresh, the oldest insertions are evicted. Entries are
+    only ever (re)inserted here, so dict order is timestamp order and
+    FIFO eviction removes the entries closest to expiry.
+    """
+    now = time.monotonic()
+    if len(_analytics_cache) >= _ANALYTICS_CACHE_MAX_ENTRIES:
+        cutoff = now - _ANALYTICS_CACHE_TTL_SECONDS
+        expired = [k for k, (cached_at, _) in _analytics_cache.items() if cached_at < cutoff]
+        for stale_key in expired:
+            _analytics_cache.pop(stale_key, None)
+        while len(_analytics_cache) >= _ANALYTICS_CACHE_MAX_ENTRIES:
+            _analytics_cache.pop(next(iter(_analytics_cache)))
+    _analytics_cache[key] = (now, value)
+
+
+def _has_tasks(session: Session, user_id: str) -> bool:
+    """Return whether the user has any tasks at all (cached).
+
+    True entries are trusted indefinitely; False entries expire after the
+    cache TTL so an empty state can never be pinned by writes this process
+    did not observe.
+    """
+    entry = _user_has_tasks.get(user_id)
+    if entry is not None:
+        cached_at, exists = entry
+        if exists or time.monotonic() - cached_at < _ANALYTICS_CACHE_TTL_SECONDS:
+            return exists
+    exists = session.exec(
+        select(Task.id).where(Task.user_id == user_id).limit(1)
+    ).first() is not None
+    _user_has_tasks[user_id] = (time.monotonic(), exists)
+    return exists
+
+
+class AnalyticsService:
+    """
+    Service class for analytics operations.
+
+    Provides methods for:
+    - Get completion stats for date range
+    - Generate heatmap data for a year
+    - Get recurring task statistics
+    - Get priority distribution
+    """
+
+    @staticmethod
+    def get_completion_stats(
+        session: Session,
+        user_id: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Dict:
+        """
+        Get task completion statistics for a user within a date range.
+
+        Args:
+            session: Database session
+            user_id: User ID for filtering
+            start_date: Optional start date filter
+            end_date: Optional end date filter
+
+        Returns:
+            Dict with total, completed, pending, completion_rate, overdue
+        """
+        cache_key = ("completion_stats", user_id, start_date, end_date)
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        if not _has_tasks(session, user_id):
+            return {"total": 0, "completed": 0, "pending": 0, "completion_rate": 0, "overdue": 0}
+
+        try:
+            # Single SQL aggregate: COUNT/SUM(CASE) returns three scalars
+            # instead of shipping every task row over the wire and counting
+            # in Python
+            now = date.today()
+            stats_query = select(
+                func.count(),
+                func.coalesce(func.sum(case((Task.completed == True, 1), else_=0)), 0),
+                func.coalesce(
+                    func.sum(
+                        case(
+                            (and_(Task.completed == False, Task.due_date < now), 1),
+                            else_=0,
+                        )
+                    ),
+                    0,
+                ),
+            ).where(Task.user_id == user_id)
+
+            # Apply date filters on created_at
+            if start_date:
+                stats_query = stats_query.where(Task.created_at >= datetime.combine(start_date, _MIN_TIME))
+            if end_date:
+                stats_query = stats_query.where(Task.created_at <= datetime.combine(end_date, _MAX_TIME))
+
+            total, completed, overdue = session.exec(stats_query).one()
+
+            pending = total - completed
+            completion_rate = (completed / total * 100) if total > 0 else 0
+
+            logger.info(f"Retrieved completion stats for user {user_id}: {total} tasks")
+
+            stats = {
+                "total": total,
+                "completed": completed,
+                "pending": pending,
+                "completion_rate": round(completion_rate, 1),
+                "overdue": overdue,
+            }
+            _cache_put(cache_key, stats)
+            return stats
+
+        except Exception as e:
+            logger.error(f"Error getting completion stats for user {user_id}: {e}")
+            raise
+
+    @staticmethod
+    def get_heatmap_data(
+        session: Session,
+        user_id: str,
+        year: int
+    ) -> List[Dict]:
+        """
+        Generate heatmap data showing completions per day for a year.
+
+        Args:
+            session: Database session
+            user_id: User ID for filtering
+            year: Year to generate data for
+
+        Returns:
+            List of {date: YYYY-MM-DD, count: int, level: 0-4}
+        """
+        cache_key = ("heatmap", user_id, year)
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        if not _has_tasks(session, user_id):
+            year_start = date(year, 1, 1)
+            num_days = (date(year, 12, 31) - year_start).days + 1
+            return [
+                {
+                    "date": (year_start + timedelta(days=i)).isoformat(),
+                    "count": 0,
+                    "level": 0,
+                }
+                for i in range(num_days)
+            ]
+
+        try:
+            # Get start and end of year
+            year_start = date(year, 1, 1)
+            year_end = date(year, 12, 31)
+
+            # Group by day in SQL: only (day, count) pairs cross the wire
+            # instead of every completed task row for the year
+            day_expr = func.date(Task.updated_at)
+            query = (
+                select(day_expr, func.count())
+                .where(
+                    (Task.user_id == user_id) &
+                    (Task.completed == True) &
+                    (Task.updated_at >= datetime.combine(year_start, _MIN_TIME)) &
+                    (Task.updated_at <= datetime.combine(year_end, _MAX_TIME))
+                )
+                .group_by(day_expr)
+            )
+
+            # str() normalizes the day key: Postgres returns date objects,
+            # SQLite returns 'YYYY-MM-DD' strings
+            completions_by_day = {
+                str(day): count for day, count in session.exec(query).all()
+            }
+
+            # Build heatmap data for entire year: precompute the day strings
+            # and assemble with comprehensions instead of a stateful
+            # while-loop of repeated timedelta adds and appends
+            num_days = (year_end - year_start).days + 1
+            day_strs = [
+                (year_start + timedelta(days=i)).isoformat()
+                for i in range(num_days)
+            ]
+            counts = [completions_by_day.get(day, 0) for day in day_strs]
+            heatmap_data = [
+                {
+                    "date": day,
+                    "count": count,
+                    "level": AnalyticsService._heatmap_level(count),
+                }
+                for day, count in zip(day_strs, counts)
+            ]
+
+            logger.info(f"Generated heatmap data for user {user_id}, year {year}")
+
+            _cache_put(cache_key, heatmap_data)
+            return heatmap_data
+
+        except Exception as e:
+            logger.error(f"Error generating heatmap for user {user_id}: {e}")
+            raise
+
+    @staticmethod
+    def invalidate_user(user_id: str) -> None:
+        """
+        Drop every cached analytics result for a user.
+
+        Called by the task services after writes that change completion
+        state or task counts, so dashboards never serve stale numbers
+        longer than the write-to-read gap.
+
+        Args:
+            user_id: User whose cached analytics should be evicted
+        """
+        stale_keys = [key for key in _analytics_cache if key[1] == user_id]
+        for key in stale_keys:
+            _analytics_cache.pop(key, None)
+        _user_has_tasks.pop(user_id, None)
+
+    @staticmethod
+    def _heatmap_level(count: int) -> int:
+        """Map a per-day completion count to a heatmap intensity level (0-4).
+
+        Table lookup on the capped count instead of a four-branch cascade -
+        one index operation per day rather than mispredictable comparisons.
+        """
+        return _LEVEL_LUT[count if count < 7 else 6]
+
+    @staticmethod
+    def get_recurring_stats(
+        session: Session,
+        user_id: str
+    ) -> Dict:
+        """
+        Get statistics for recurring tasks.
+
+        Args:
+            session: Database session
+            user_id: User ID for filtering
+
+        Returns:
+            Dict with total_patterns, active_patterns, completion_rate, current_streak
+        """
+        cache_key = ("recurring_stats", user_id)
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        if not _has_tasks(session, user_id):
+            return {
+                "total_patterns": 0,
+                "active_patterns": 0,
+                "total_instances": 0,
+                "completed_instances": 0,
+                "completion_rate": 0,
+                "current_streak": 0,
+            }
+
+        try:
+            # One conditional-sum aggregate replaces two full-row SELECTs
+            # (patterns and instances): four scalars come back instead of
+            # every recurring task being materialized as an ORM object
+            is_pattern = and_(Task.is_recurring == True, Task.parent_task_id == None)
+            is_instance = Task.parent_task_id != None
+            stats_query = select(
+                func.coalesce(func.sum(case((is_pattern, 1), else_=0)), 0),
+                func.coalesce(
+                    func.sum(case((and_(is_pattern, Task.completed == False), 1), else_=0)), 0
+                ),
+                func.coalesce(func.sum(case((is_instance, 1), else_=0)), 0),
+                func.coalesce(
+                    func.sum(case((and_(is_instance, Task.completed == True), 1), else_=0)), 0
+                ),
+            ).where(Task.user_id == user_id)
+
+            total_patterns, active_patterns, instance_total, instance_completed = (
+                session.exec(stats_query).one()
+            )
+            completion_rate = (instance_completed / instance_total * 100) if instance_total > 0 else 0
+
+            # Calculate current streak (consecutive days with completed recurring tasks)
+            streak = AnalyticsService._calculate_streak(session, user_id)
+
+            logger.info(f"Retrieved recurring stats for user {user_id}")
+
+            stats = {
+                "total_patterns": total_patterns,
+                "active_patterns": active_patterns,
+                "total_instances": instance_total,
+                "completed_instances": instance_completed,
+                "completion_rate": round(completion_rate, 1),
+                "current_streak": streak,
+            }
+            _cache_put(cache_key, stats)
+            return stats
+
+        except Exception as e:
+            logger.error(f"Error getting recurring stats for user {user_id}: {e}")
+            raise
+
+    @staticmethod
+    def _calculate_streak(session: Session, user_id: str) -> int:
+        """Calculate the current streak of consecutive days with completed recurring tasks."""
+        try:
+            # DISTINCT on date(updated_at) in SQL: at most ~one row per day
+            # crosses the wire instead of every completed instance being
+            # materialized as a Task object. LIMIT keeps the scan bounded to
+            # roughly a year of recent days - a longer streak than that is
+            # not realistic.
+            day_expr = func.date(Task.updated_at)
+            query = (
+                select(func.distinct(day_expr))
+                .where(
+                    (Task.user_id == user_id) &
+                    (Task.completed == True) &
+                    (Task.parent_task_id != None)
+                )
+                .order_by(day_expr.desc())
+                .limit(400)
+            )
+
+            rows = session.exec(query).all()
+
+            if not rows:
+                return 0
+
+            # Normalize day keys: Postgres returns date objects, SQLite
+            # returns 'YYYY-MM-DD' strings
+            days_with_completions = {
+                day if isinstance(day, date) else date.fromisoformat(day)
+                for day in rows
+                if day is not None
+            }
+
+            # Count consecutive days from today backwards
+            streak = 0
+            check_date = date.today()
+
+            # If today hasn't had any, start from yesterday
+            if check_date not in days_with_completions:
+                check_date -= timedelta(days=1)
+
+            while check_date in days_with_completions:
+                streak += 1
+                check_date -= timedelta(days=1)
+
+            return streak
+
+        except Exception as e:
+            logger.error(f"Error calculating streak for user {user_id}: {e}")
+            return 0
+
+    @staticmethod
+    def get_priority_distribution(
+        session: Session,
+        user_id: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Dict:
+        """
+        Get task distribution by priority.
+
+        Args:
+            session: Database session
+            user_id: User ID for filtering
+            start_date: Optional start date filter
+            end_date: Optional end date filter
+
+        Returns:
+            Dict with High, Medium, Low counts and percentages
+        """
+        if not _has_tasks(session, user_id):
+            return {
+                "total": 0,
+                "high": {"count": 0, "percentage": 0.0},
+                "medium": {"count": 0, "percentage": 0.0},
+                "low": {"count": 0, "percentage": 0.0},
+            }
+
+        try:
+            # GROUP BY in SQL: only (priority, count) pairs cross the wire
+            base_query = (
+                select(Task.priority, func.count())
+                .where(Task.user_id == user_id)
+                .group_by(Task.priority)
+            )
+
+            if start_date:
+                base_query = base_query.where(Task.created_at >= datetime.combine(start_date, _MIN_TIME))
+            if end_date:
+                base_query = base_query.where(Task.created_at <= datetime.combine(end_date, _MAX_TIME))
+
+            counts = dict(session.exec(base_query).all())
+
+            high = counts.get(PriorityType.High, 0)
+            medium = counts.get(PriorityType.Medium, 0)
+            low = counts.get(PriorityType.Low, 0)
+            total = sum(counts.values())
+
+            # One reciprocal instead of a division per priority tier
+            pct = 100.0 / total if total else 0.0
+
+            return {
+                "total": total,
+                "high": {"count": high, "percentage": round(high * pct, 1)},
+                "medium": {"count": medium, "percentage": round(medium * pct, 1)},
+                "low": {"count": low, "percentage": round(low * pct, 1)},
+            }
+
+        except Exception as e:
+            logger.error(f"Error getting priority distribution for user {user_id}: {e}")
+            raise
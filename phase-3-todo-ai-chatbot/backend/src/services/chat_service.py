@@ -7,6 +7,7 @@ Implements multi-provider model factory pattern for flexibility.
 Reference: openai-agents-mcp-integration skill sections 3.1, 3.2, 3.3
 """
 import os
+import threading
 from pathlib import Path
 from typing import Optional
 
@@ -14,6 +15,7 @@ from dotenv import load_dotenv
 
 from agents import Agent, ModelSettings, OpenAIChatCompletionsModel, AsyncOpenAI
 from agents.mcp import MCPServerStdio
+from ..agent_config.todo_agent import MCP_ENV_ALLOWLIST
 from ..config import get_settings
 
 # Load .env file at module level for multi-provider configuration
@@ -225,7 +227,13 @@ class TodoAgent:
             params={
                 "command": "python",
                 "args": ["-m", "mcp_server"],
-                "env": os.environ.copy()
+                # Allow-listed env: the tool subprocess only needs db/auth
+                # config, not the whole parent environment
+                "env": {
+                    k: os.environ[k]
+                    for k in MCP_ENV_ALLOWLIST
+                    if k in os.environ
+                },
             },
             client_session_timeout_seconds=30.0  # Increase from default 5s
         )
@@ -252,16 +260,23 @@ class TodoAgent:
 
 # Singleton instance for FastAPI dependency injection
 _todo_agent_instance: Optional[TodoAgent] = None
+_todo_agent_lock = threading.Lock()
 
 
 def get_todo_agent() -> TodoAgent:
     """
     Get or create singleton TodoAgent instance.
 
+    Double-checked locking: without the lock, concurrent requests racing
+    through the None check would each construct a TodoAgent and spawn
+    their own MCP server subprocess.
+
     Returns:
         TodoAgent instance
     """
     global _todo_agent_instance
     if _todo_agent_instance is None:
-        _todo_agent_instance = TodoAgent()
+        with _todo_agent_lock:
+            if _todo_agent_instance is None:
+                _todo_agent_instance = TodoAgent()
     return _todo_agent_instance
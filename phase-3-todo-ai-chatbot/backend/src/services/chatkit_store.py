@@ -8,9 +8,11 @@ This module provides:
 Reference: reference-phase3/backend/services/chatkit_store.py
 """
 
+import asyncio
 import logging
 import uuid
-from datetime import datetime
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone
 from typing import Any, Optional, Union, Literal
 
 from chatkit.server import (
@@ -23,16 +25,74 @@ from chatkit.types import (
     AssistantMessageItem,
     UserMessageTextContent,
     AssistantMessageContent,
+    InferenceOptions,
 )
+from sqlalchemy import bindparam, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from ..db.async_session import bulk_insert_messages
 from ..models.conversation import Conversation
 from ..models.message import Message
 
+logger = logging.getLogger(__name__)
+
 # ThreadItem is a union type of message items
 ThreadItem = Union[UserMessageItem, AssistantMessageItem]
 
+# Streaming message-write batching: rows buffered by add_thread_item are
+# flushed in one multi-row INSERT when the batch reaches this size or age.
+BULK_RECORDER_SIZE = 50
+BULK_RECORDER_FLUSH_TIMEOUT_MS = 100
+
+
+def _utcnow() -> datetime:
+    """Naive UTC now without the deprecated datetime.utcnow()."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# Shared default for rebuilt user items: validating an existing model
+# instance is a pass-through, while `inference_options={}` re-validates a
+# fresh dict per message. Never mutate this instance.
+_EMPTY_INFERENCE_OPTIONS = InferenceOptions()
+
+
+# Statement templates built once at import. SQLAlchemy keys its compiled-SQL
+# cache on statement structure, and reusing the same objects also skips the
+# per-call Core construction (Column/Clause assembly) on the hot read paths.
+_THREAD_META_STMT = select(Conversation.thread_id, Conversation.created_at).where(
+    Conversation.thread_id == bindparam("thread_id"),
+    Conversation.user_id == bindparam("user_id"),
+)
+# id breaks ties so the keyset cursor in load_threads is total-ordered
+_THREADS_BY_USER_STMT = (
+    select(Conversation)
+    .where(Conversation.user_id == bindparam("user_id"))
+    .order_by(Conversation.updated_at.desc(), Conversation.id.desc())
+)
+# Only the columns the ChatKit items need: the covering index can answer
+# this index-only, and no Message ORM instances are hydrated
+_ITEMS_BY_CONV_STMT = (
+    select(
+        Message.chatkit_item_id,
+        Message.role,
+        Message.content,
+        Message.created_at,
+    )
+    .where(
+        Message.conversation_id == bindparam("conv_id"),
+        Message.user_id == bindparam("user_id"),
+    )
+    .order_by(Message.created_at)
+)
+_ITEM_BY_CHATKIT_ID_STMT = select(Message).where(
+    Message.chatkit_item_id == bindparam("item_id"),
+    Message.conversation_id == bindparam("conv_id"),
+    Message.user_id == bindparam("user_id"),
+)
+
 
 class MemoryStore(Store):
     """Simple in-memory store for ChatKit threads and items."""
@@ -40,7 +100,10 @@ class MemoryStore(Store):
     def __init__(self):
         """Initialize empty storage."""
         self._threads: dict[str, ThreadMetadata] = {}
-        self._items: dict[str, list[ThreadItem]] = {}
+        # thread_id -> {item_id: item}. Inner dicts preserve insertion
+        # order, so item lookup/update/delete are O(1) instead of list
+        # scans while iteration order stays chronological.
+        self._items: dict[str, dict[str, ThreadItem]] = {}
         self._attachments: dict[str, Any] = {}
 
     async def save_thread(
@@ -74,9 +137,12 @@ class MemoryStore(Store):
         context: Any,
     ) -> Page[ThreadMetadata]:
         """Load all threads with pagination."""
-        threads = list(self._threads.values())
+        # deque(maxlen=limit) keeps only the tail while iterating: O(N)
+        # time but O(limit) space, vs materializing the full list just to
+        # slice its end
+        threads = deque(self._threads.values(), maxlen=limit or None)
         return Page(
-            data=threads[-limit:] if limit else threads,
+            data=list(threads),
             has_more=False,
             after=None,
         )
@@ -101,9 +167,9 @@ class MemoryStore(Store):
         context: Any,
     ) -> Page[ThreadItem]:
         """Load items (messages, widgets) for a thread."""
-        items = self._items.get(thread_id, [])
+        items = deque(self._items.get(thread_id, {}).values(), maxlen=limit or None)
         return Page(
-            data=items[-limit:] if limit else items,
+            data=list(items),
             has_more=False,
             after=None,
         )
@@ -115,9 +181,7 @@ class MemoryStore(Store):
         context: Any,
     ) -> None:
         """Add a thread item (message, widget, etc.)."""
-        if thread_id not in self._items:
-            self._items[thread_id] = []
-        self._items[thread_id].append(item)
+        self._items.setdefault(thread_id, {})[item.id] = item
 
     async def save_item(
         self,
@@ -126,16 +190,9 @@ class MemoryStore(Store):
         context: Any,
     ) -> None:
         """Save/update a thread item."""
-        if thread_id not in self._items:
-            self._items[thread_id] = []
-
-        # Update existing item or append new one
-        items = self._items[thread_id]
-        for i, existing in enumerate(items):
-            if existing.id == item.id:
-                items[i] = item
-                return
-        items.append(item)
+        # Assigning an existing key keeps its position, so updates don't
+        # reorder the thread
+        self._items.setdefault(thread_id, {})[item.id] = item
 
     async def load_item(
         self,
@@ -144,11 +201,10 @@ class MemoryStore(Store):
         context: Any,
     ) -> ThreadItem:
         """Load a single item by ID."""
-        items = self._items.get(thread_id, [])
-        for item in items:
-            if item.id == item_id:
-                return item
-        raise ValueError(f"Item {item_id} not found in thread {thread_id}")
+        item = self._items.get(thread_id, {}).get(item_id)
+        if item is None:
+            raise ValueError(f"Item {item_id} not found in thread {thread_id}")
+        return item
 
     async def delete_thread_item(
         self,
@@ -157,11 +213,7 @@ class MemoryStore(Store):
         context: Any,
     ) -> None:
         """Delete a thread item."""
-        if thread_id in self._items:
-            self._items[thread_id] = [
-                item for item in self._items[thread_id]
-                if item.id != item_id
-            ]
+        self._items.get(thread_id, {}).pop(item_id, None)
 
     async def save_attachment(
         self,
@@ -206,7 +258,16 @@ class MemoryStore(Store):
 
 
 class DatabaseStore(Store):
-    """Database-backed store for ChatKit threads and items using SQLModel."""
+    """Database-backed store for ChatKit threads and items using SQLModel.
+
+    Every method checks a session out of the engine pool behind
+    session_factory, so throughput depends on that engine's tuning: the
+    app engine (db/async_session.py) runs without pool_pre_ping, with
+    asyncpg's statement cache enabled and jit off, which together with
+    the stable statement templates above gives prepared-statement reuse
+    across calls. Avoid patterns that defeat it (per-call refresh(),
+    dynamically-built SQL on hot paths).
+    """
 
     def __init__(self, session_factory: Any):
         """
@@ -216,121 +277,164 @@ class DatabaseStore(Store):
             session_factory: Async session factory for database operations
         """
         self.session_factory = session_factory
+        # (thread_id, user_id) -> conversation id. Nearly every Store
+        # method resolves this mapping first and it never changes for the
+        # life of a thread, so repeat calls become a dict lookup instead
+        # of a DB round-trip. Per-key locks coalesce concurrent misses
+        # (back-to-back add_thread_item during streaming) into one upsert.
+        self._conv_id_cache: dict[tuple[str, str], uuid.UUID] = {}
+        self._conv_id_locks: defaultdict[tuple[str, str], asyncio.Lock] = defaultdict(
+            asyncio.Lock
+        )
+        # Message rows buffered by add_thread_item. Committing per streamed
+        # message pays a network round-trip plus WAL fsync each time;
+        # buffering and flushing one multi-row INSERT amortizes both.
+        # Reads drain the buffer first so they see their own writes.
+        self._pending: list[dict] = []
+        self._pending_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_wakeup = asyncio.Event()
 
     async def _get_conversation_id(
         self,
         thread_id: str,
         user_id: str,
+        session: AsyncSession | None = None,
     ):
         """
         Get or create conversation ID from ChatKit thread_id.
 
-        1. First checks if conversation with this thread_id already exists
-        2. If exists, returns its UUID id
-        3. If not exists, creates new conversation and returns its id
+        Runs a single upsert: inserts the conversation if the thread is
+        new, otherwise touches updated_at on the existing row, and
+        returns the conversation id either way.
 
         Args:
             thread_id: Thread ID (UUID string from ChatKit)
             user_id: User's ID
+            session: Caller's session to reuse on a cache miss; when
+                omitted a dedicated one is opened
 
         Returns:
             UUID: Conversation ID, or None if operation fails
         """
-        import logging
-
-        # First, check if conversation with this thread_id already exists
-        try:
-            async with self.session_factory() as session:
-                result = await session.execute(
-                    select(Conversation).where(
-                        Conversation.thread_id == thread_id,
-                        Conversation.user_id == user_id
-                    )
-                )
-                existing = result.scalar_one_or_none()
-                if existing:
-                    logging.debug(f"Found existing conversation {existing.id} for thread {thread_id}")
-                    return existing.id
-        except Exception as e:
-            logging.warning(f"Error checking for existing conversation: {e}")
-
-        # Conversation doesn't exist - create new one
+        cache_key = (thread_id, user_id)
+        cached = self._conv_id_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        async with self._conv_id_locks[cache_key]:
+            # Re-check: a concurrent caller may have resolved it while we
+            # waited for the lock
+            cached = self._conv_id_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            conv_id = await self._upsert_conversation(thread_id, user_id, session)
+            if conv_id is not None:
+                self._conv_id_cache[cache_key] = conv_id
+                # Later calls hit the cache above, so the lock has done its
+                # job - drop it to keep the dict from growing with threads.
+                # Current waiters still hold their reference and re-check
+                # the cache on wake
+                self._conv_id_locks.pop(cache_key, None)
+            return conv_id
+
+    async def _upsert_conversation(
+        self,
+        thread_id: str,
+        user_id: str,
+        session: AsyncSession | None = None,
+    ):
+        """Resolve the conversation id in the database (cache miss path)."""
+        # Single round-trip upsert: INSERT ... ON CONFLICT (thread_id)
+        # DO UPDATE ... RETURNING id replaces the old SELECT-then-INSERT
+        # (two sessions, two round-trips on the cold path) and removes the
+        # race-retry block - ON CONFLICT makes the race impossible. The
+        # user_id guard on DO UPDATE preserves isolation: a thread_id owned
+        # by another user updates nothing and returns no row.
         try:
-            # Use naive datetime (UTC) to match TIMESTAMP WITHOUT TIME ZONE column
-            now = datetime.utcnow()
-            title = f"Conversation {now.strftime('%Y-%m-%d %H:%M')}"
-
+            if session is not None:
+                return await self._execute_upsert(session, thread_id, user_id)
             async with self.session_factory() as session:
-                conversation = Conversation(
-                    user_id=user_id,
-                    thread_id=thread_id,  # Use ChatKit's thread_id (required, NOT NULL, UNIQUE)
-                    title=title,
-                    is_active=True,
-                    created_at=now,
-                    updated_at=now,
-                )
-                session.add(conversation)
-                await session.commit()
-                await session.refresh(conversation)
-                logging.debug(f"Created new conversation {conversation.id} for thread {thread_id}")
-                return conversation.id
+                return await self._execute_upsert(session, thread_id, user_id)
         except Exception as e:
-            logging.warning(f"Failed to create conversation for thread {thread_id}: {e}")
-            # Try one more time to get existing (race condition handling)
-            try:
-                async with self.session_factory() as session:
-                    result = await session.execute(
-                        select(Conversation).where(
-                            Conversation.thread_id == thread_id,
-                            Conversation.user_id == user_id
-                        )
-                    )
-                    existing = result.scalar_one_or_none()
-                    if existing:
-                        return existing.id
-            except Exception:
-                pass
+            logger.warning(f"Failed to get/create conversation for thread {thread_id}: {e}")
             return None
 
+    async def _execute_upsert(
+        self,
+        session: AsyncSession,
+        thread_id: str,
+        user_id: str,
+    ):
+        """Run the conversation upsert on the given session."""
+        # Use naive datetime (UTC) to match TIMESTAMP WITHOUT TIME ZONE column
+        now = _utcnow()
+        title = f"Conversation {now.strftime('%Y-%m-%d %H:%M')}"
+
+        dialect = session.get_bind().dialect.name
+        insert_fn = pg_insert if dialect == "postgresql" else sqlite_insert
+        stmt = (
+            insert_fn(Conversation)
+            .values(
+                id=uuid.uuid4(),
+                user_id=user_id,
+                thread_id=thread_id,  # Use ChatKit's thread_id (required, NOT NULL, UNIQUE)
+                title=title,
+                is_active=True,
+                created_at=now,
+                updated_at=now,
+            )
+            .on_conflict_do_update(
+                index_elements=["thread_id"],
+                set_={"updated_at": now},
+                where=(Conversation.user_id == user_id),
+            )
+            .returning(Conversation.id)
+        )
+        result = await session.execute(stmt)
+        await session.commit()
+        conv_id = result.scalar_one_or_none()
+        if conv_id is None:
+            logger.warning(
+                f"Thread {thread_id} exists but belongs to another user"
+            )
+        return conv_id
+
     async def save_thread(
         self,
         thread: ThreadMetadata,
         context: Any,
     ) -> None:
         """Save or update a thread (conversation)."""
-        import logging
-
         user_id = context.get("user_id")
         if not user_id:
-            logging.warning("save_thread: No user_id in context")
+            logger.warning("save_thread: No user_id in context")
             return
 
         original_thread_id = thread.id
-        logging.info(f"save_thread: Incoming thread_id={original_thread_id}, user_id={user_id}")
+        logger.info(f"save_thread: Incoming thread_id={original_thread_id}, user_id={user_id}")
 
-        # Get or create conversation ID
-        conv_id = await self._get_conversation_id(thread.id, user_id)
-        if not conv_id:
-            logging.warning(f"save_thread: Failed to get/create conversation for thread_id={thread.id}")
-            return
+        # One session serves both the conversation lookup and the update
+        async with self.session_factory() as session:
+            conv_id = await self._get_conversation_id(thread.id, user_id, session)
+            if not conv_id:
+                logger.warning(f"save_thread: Failed to get/create conversation for thread_id={thread.id}")
+                return
 
-        logging.info(f"save_thread: Got conv_id={conv_id} for thread_id={original_thread_id}")
+            logger.info(f"save_thread: Got conv_id={conv_id} for thread_id={original_thread_id}")
 
-        # Update existing conversation's timestamp
-        async with self.session_factory() as session:
-            result = await session.execute(
-                select(Conversation).where(
+            # Bump the timestamp with a single UPDATE instead of
+            # load-modify-save: no SELECT, no ORM hydration, one statement.
+            # The user_id predicate keeps the isolation guarantee
+            await session.execute(
+                update(Conversation)
+                .where(
                     Conversation.id == conv_id,
-                    Conversation.user_id == user_id
+                    Conversation.user_id == user_id,
                 )
+                .values(updated_at=_utcnow())
             )
-            conversation = result.scalar_one_or_none()
-
-            if conversation:
-                # Use naive datetime (UTC) to match TIMESTAMP WITHOUT TIME ZONE column
-                conversation.updated_at = datetime.utcnow()
-                session.add(conversation)
-                await session.commit()
+            await session.commit()
 
     async def load_thread(
         self,
@@ -342,32 +446,24 @@ class DatabaseStore(Store):
         if not user_id:
             return None
 
-        conv_id = await self._get_conversation_id(thread_id, user_id)
-        if not conv_id:
-            logging.warning(f"load_thread: No conversation found for thread_id={thread_id}, user_id={user_id}")
-            return None
-
+        # One query straight off thread_id + user_id: the old path resolved
+        # the conversation id first and then re-fetched the same row by id.
+        # A probe for an unknown thread just returns None - creating the
+        # conversation belongs to save_thread's upsert, not a read
         async with self.session_factory() as session:
             result = await session.execute(
-                select(Conversation).where(
-                    Conversation.id == conv_id,
-                    Conversation.user_id == user_id
-                )
+                _THREAD_META_STMT, {"thread_id": thread_id, "user_id": user_id}
             )
-            conversation = result.scalar_one_or_none()
-
-            if conversation:
-                # Return the original thread_id (ChatKit's UUID), not the internal DB id
-                metadata = ThreadMetadata(
-                    id=conversation.thread_id,
-                    created_at=conversation.created_at,
-                )
-                logging.debug(f"load_thread: Returning metadata for thread_id={thread_id}, created_at={metadata.created_at}")
-                return metadata
+            row = result.one_or_none()
 
-            logging.warning(f"load_thread: Conversation not found for conv_id={conv_id}")
+        if row is None:
+            logger.warning(f"load_thread: No conversation found for thread_id={thread_id}, user_id={user_id}")
             return None
 
+        metadata = ThreadMetadata(id=row.thread_id, created_at=row.created_at)
+        logger.debug(f"load_thread: Returning metadata for thread_id={thread_id}, created_at={metadata.created_at}")
+        return metadata
+
     async def load_threads(
         self,
         limit: int,
@@ -375,24 +471,48 @@ class DatabaseStore(Store):
         order: str,
         context: Any,
     ) -> Page[ThreadMetadata]:
-        """Load all threads (conversations) for user."""
+        """Load the user's threads, newest first, with keyset pagination.
+
+        The cursor packs the last row's (updated_at, id) as
+        "<iso timestamp>|<uuid>"; the row-value comparison seeks straight
+        into the (user_id, updated_at) index instead of sorting and
+        re-scanning everything before the requested page.
+        """
         user_id = context.get("user_id")
         if not user_id:
             return Page(data=[], has_more=False, after=None)
 
         try:
             async with self.session_factory() as session:
-                from sqlalchemy import desc
-                query = select(Conversation).where(
-                    Conversation.user_id == user_id
-                ).order_by(desc(Conversation.updated_at))
-
+                query = _THREADS_BY_USER_STMT
+                if after:
+                    try:
+                        ts_str, id_str = after.split("|", 1)
+                        after_ts = datetime.fromisoformat(ts_str)
+                        after_id = uuid.UUID(id_str)
+                    except ValueError:
+                        logger.warning(f"load_threads: Ignoring malformed cursor {after!r}")
+                    else:
+                        query = query.where(
+                            tuple_(Conversation.updated_at, Conversation.id)
+                            < tuple_(after_ts, after_id)
+                        )
                 if limit:
-                    query = query.limit(limit)
+                    # Fetch one extra row to learn whether a next page exists
+                    query = query.limit(limit + 1)
 
-                result = await session.execute(query)
+                result = await session.execute(query, {"user_id": user_id})
                 conversations = result.scalars().all()
 
+                has_more = bool(limit) and len(conversations) > limit
+                if has_more:
+                    conversations = conversations[:limit]
+
+                next_after = None
+                if has_more:
+                    last = conversations[-1]
+                    next_after = f"{last.updated_at.isoformat()}|{last.id}"
+
                 # Return original thread_id (ChatKit's UUID), not internal DB id
                 threads = [
                     ThreadMetadata(
@@ -401,10 +521,9 @@ class DatabaseStore(Store):
                     )
                     for c in conversations
                 ]
-                return Page(data=threads, has_more=False, after=None)
+                return Page(data=threads, has_more=has_more, after=next_after)
         except Exception as e:
-            import logging
-            logging.warning(f"Failed to load threads from database: {e}, returning empty list")
+            logger.warning(f"Failed to load threads from database: {e}, returning empty list")
             return Page(data=[], has_more=False, after=None)
 
     async def delete_thread(
@@ -417,25 +536,22 @@ class DatabaseStore(Store):
         if not user_id:
             return
 
-        conv_id = await self._get_conversation_id(thread_id, user_id)
-        if not conv_id:
-            return
-
         async with self.session_factory() as session:
-            result = await session.execute(
-                select(Conversation).where(
-                    Conversation.id == conv_id,
-                    Conversation.user_id == user_id
-                )
-            )
-            conversation = result.scalar_one_or_none()
+            conv_id = await self._get_conversation_id(thread_id, user_id, session)
+            if not conv_id:
+                return
+
+            conversation = await session.get(Conversation, conv_id)
 
-            if conversation:
+            if conversation and conversation.user_id == user_id:
                 # Mark as inactive instead of deleting
                 conversation.is_active = False
                 session.add(conversation)
                 await session.commit()
 
+        self._conv_id_cache.pop((thread_id, user_id), None)
+        self._conv_id_locks.pop((thread_id, user_id), None)
+
     async def load_thread_items(
         self,
         thread_id: str,
@@ -445,36 +561,38 @@ class DatabaseStore(Store):
         context: Any,
     ) -> Page:
         """Load items (messages) for a thread."""
-        import logging
-
         user_id = context.get("user_id")
         if not user_id:
-            logging.warning("load_thread_items: No user_id in context")
+            logger.warning("load_thread_items: No user_id in context")
             return Page(data=[], has_more=False, after=None)
 
-        logging.info(f"load_thread_items: thread_id={thread_id}, user_id={user_id}, limit={limit}")
+        logger.info(f"load_thread_items: thread_id={thread_id}, user_id={user_id}, limit={limit}")
 
-        conv_id = await self._get_conversation_id(thread_id, user_id)
-        if not conv_id:
-            logging.warning(f"load_thread_items: No conversation found for thread_id={thread_id}")
-            return Page(data=[], has_more=False, after=None)
+        async with self.session_factory() as session:
+            conv_id = await self._get_conversation_id(thread_id, user_id, session)
+            if not conv_id:
+                logger.warning(f"load_thread_items: No conversation found for thread_id={thread_id}")
+                return Page(data=[], has_more=False, after=None)
 
-        logging.info(f"load_thread_items: Found conv_id={conv_id} for thread_id={thread_id}")
+            logger.info(f"load_thread_items: Found conv_id={conv_id} for thread_id={thread_id}")
 
-        async with self.session_factory() as session:
-            query = select(Message).where(
-                Message.conversation_id == conv_id,
-                Message.user_id == user_id
-            ).order_by(Message.created_at)
+            # Read-your-writes: drain any buffered inserts before querying
+            await self.flush_pending()
 
+            query = _ITEMS_BY_CONV_STMT
             if limit:
                 query = query.limit(limit)
 
-            result = await session.execute(query)
-            messages = result.scalars().all()
+            # Stream rows in chunks instead of buffering the whole
+            # resultset: for long threads only ~100 driver rows plus the
+            # ChatKit items built so far are resident at any point
+            result = await session.stream(
+                query.execution_options(yield_per=100),
+                {"conv_id": conv_id, "user_id": user_id},
+            )
 
             items = []
-            for m in messages:
+            async for m in result:
                 # CRITICAL: Use chatkit_item_id instead of database ID
                 # This ensures frontend message IDs match what was streamed
                 # and prevents the "first message disappears" bug
@@ -485,8 +603,8 @@ class DatabaseStore(Store):
                         id=item_id,  # Use preserved ChatKit ID
                         thread_id=thread_id,
                         created_at=m.created_at,
-                        content=[UserMessageTextContent(type="input_text", text=m.content)],
-                        inference_options={},
+                        content=[UserMessageTextContent(text=m.content)],
+                        inference_options=_EMPTY_INFERENCE_OPTIONS,
                     )
                 else:
                     # Create AssistantMessageItem with proper content structure
@@ -494,12 +612,15 @@ class DatabaseStore(Store):
                         id=item_id,  # Use preserved ChatKit ID
                         thread_id=thread_id,
                         created_at=m.created_at,
-                        content=[AssistantMessageContent(type="output_text", text=m.content)],
+                        content=[AssistantMessageContent(text=m.content)],
                     )
                 items.append(item)
-                logging.debug(f"  Loaded item: id={item_id[:8]}..., role={m.role}, created_at={m.created_at.isoformat()}")
+                # Guarded so the slicing/isoformat work is skipped per item
+                # when DEBUG logging is off
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"  Loaded item: id={item_id[:8]}..., role={m.role}, created_at={m.created_at.isoformat()}")
 
-            logging.info(f"load_thread_items: Returning {len(items)} items for thread_id={thread_id}")
+            logger.info(f"load_thread_items: Returning {len(items)} items for thread_id={thread_id}")
             return Page(data=items, has_more=False, after=None)
 
     async def add_thread_item(
@@ -509,8 +630,6 @@ class DatabaseStore(Store):
         context: Any,
     ) -> None:
         """Add a thread item (message) to database."""
-        import logging
-
         user_id = context.get("user_id")
         if not user_id:
             return
@@ -522,26 +641,28 @@ class DatabaseStore(Store):
         try:
             # Extract content - handle both string and list of content objects
             content = getattr(item, "content", str(item))
-            if isinstance(content, list):
-                # ChatKit sends content as list of content objects
-                # Extract text from each and join
+            if isinstance(content, list) and len(content) == 1:
+                # Fast path: nearly every message carries exactly one
+                # content element, so skip the list/join machinery
+                c0 = content[0]
+                if isinstance(c0, (UserMessageTextContent, AssistantMessageContent)):
+                    content = c0.text.strip() if c0.text else ""
+                else:
+                    content = str(c0).strip()
+            elif isinstance(content, list):
+                # ChatKit sends content as list of content objects.
+                # isinstance on the concrete content types replaces the old
+                # hasattr/getattr cascade - a C-level check per element
+                # instead of reflective attribute probing on every message
                 text_parts = []
                 for content_item in content:
-                    if hasattr(content_item, "text"):
-                        # UserMessageTextContent, AssistantMessageContent have .text
-                        text = str(content_item.text).strip()
-                        if text:  # Only add non-empty text
-                            text_parts.append(text)
-                    elif hasattr(content_item, "type") and content_item.type in ("input_text", "output_text"):
-                        # Handle content items with type field
-                        text = str(getattr(content_item, "text", "")).strip()
-                        if text:
-                            text_parts.append(text)
+                    if isinstance(content_item, (UserMessageTextContent, AssistantMessageContent)):
+                        text = content_item.text.strip() if content_item.text else ""
                     else:
                         # Fallback for other content types
                         text = str(content_item).strip()
-                        if text:
-                            text_parts.append(text)
+                    if text:  # Only add non-empty text
+                        text_parts.append(text)
                 content = " ".join(text_parts) if text_parts else ""
             else:
                 # Already a string
@@ -549,57 +670,107 @@ class DatabaseStore(Store):
 
             # Skip empty messages - don't save them to database
             if not content:
-                logging.debug(f"Skipping empty message for thread {thread_id}")
+                logger.debug(f"Skipping empty message for thread {thread_id}")
                 return
 
-            # Determine role from item type attribute
-            # ChatKit uses .type: "user_message" or "assistant_message"
-            # NOT .role attribute
-            item_type = getattr(item, "type", None)
-            if item_type == "user_message":
-                role = "user"
-            elif item_type == "assistant_message":
-                role = "assistant"
-            else:
-                # Fallback: check class name
-                class_name = type(item).__name__
-                if "User" in class_name:
-                    role = "user"
-                elif "Assistant" in class_name:
-                    role = "assistant"
-                else:
-                    role = "user"  # Default fallback
+            # Determine role from the concrete item type; anything that is
+            # not an assistant message is stored as a user message
+            role = "assistant" if isinstance(item, AssistantMessageItem) else "user"
+
+            logger.info(f"add_thread_item: Saving message role={role}, type={type(item).__name__}, thread_id={thread_id}, conv_id={conv_id}, content={content[:50]}...")
+
+            # CRITICAL: Preserve the original ChatKit item ID
+            # This ensures frontend message IDs match what was streamed
+            # and prevents the "first message disappears" bug
+            # item.id is already a string on the ChatKit item types, so the
+            # common path needs no getattr or re-stringification.
+            # Handle __fake_id__ from stream_agent_response: the OpenAI
+            # Agents SDK generates it for assistant messages, so mint a
+            # real UUID (.hex - half the formatting cost of str()).
+            chatkit_id = item.id
+            if not chatkit_id or chatkit_id == "__fake_id__":
+                chatkit_id = uuid.uuid4().hex
+                logger.debug(f"Generated new UUID for item: {chatkit_id}")
+
+            created_at = getattr(item, "created_at", None) or _utcnow()
+            message_id = uuid.uuid4()
+            row = {
+                "id": message_id,
+                "chatkit_item_id": chatkit_id,  # Preserve original ChatKit ID
+                "conversation_id": conv_id,
+                "user_id": user_id,
+                "role": role,
+                "content": content,
+                "created_at": created_at,
+                "expires_at": created_at + timedelta(days=2),
+            }
+
+            # Buffer instead of committing per message; the flush loop (or
+            # a full batch, or the next read) writes the whole batch in one
+            # multi-row INSERT
+            async with self._pending_lock:
+                self._pending.append(row)
+                batch_full = len(self._pending) >= BULK_RECORDER_SIZE
+            self._ensure_flush_loop()
+            if batch_full:
+                self._flush_wakeup.set()
+            logger.info(f"add_thread_item: Buffered message id={message_id}, chatkit_id={chatkit_id} for conversation {conv_id}")
+        except Exception as e:
+            logger.warning(f"Failed to add message to database: {e}")
 
-            logging.info(f"add_thread_item: Saving message role={role}, type={item_type}, thread_id={thread_id}, conv_id={conv_id}, content={content[:50]}...")
+    def _ensure_flush_loop(self) -> None:
+        """Start the background flush task on first use."""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
 
+    async def _flush_loop(self) -> None:
+        """Flush buffered messages on a timeout or when a batch fills."""
+        timeout = BULK_RECORDER_FLUSH_TIMEOUT_MS / 1000.0
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._flush_wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                self._flush_wakeup.clear()
+                await self.flush_pending()
+        except asyncio.CancelledError:
+            # Drain whatever is left on shutdown
+            await self.flush_pending()
+            raise
+
+    async def flush_pending(self) -> None:
+        """Write all buffered message rows in a single multi-row INSERT."""
+        async with self._pending_lock:
+            batch = self._pending
+            self._pending = []
+        if not batch:
+            return
+
+        try:
             async with self.session_factory() as session:
-                # CRITICAL: Preserve the original ChatKit item ID
-                # This ensures frontend message IDs match what was streamed
-                # and prevents the "first message disappears" bug
-                chatkit_id = getattr(item, "id", None)
-
-                # Handle __fake_id__ from stream_agent_response
-                # The OpenAI Agents SDK's stream_agent_response generates __fake_id__
-                # for assistant messages. We need to generate real UUIDs.
-                if not chatkit_id or str(chatkit_id) == "__fake_id__":
-                    chatkit_id = str(uuid.uuid4())
-                    logging.debug(f"Generated new UUID for item: {chatkit_id}")
-                else:
-                    chatkit_id = str(chatkit_id)
-
-                new_message = Message(
-                    chatkit_item_id=chatkit_id,  # Preserve original ChatKit ID
-                    conversation_id=conv_id,
-                    user_id=user_id,
-                    role=role,
-                    content=content,
-                    created_at=getattr(item, "created_at", datetime.utcnow()),
-                )
-                session.add(new_message)
-                await session.commit()
-                logging.info(f"add_thread_item: Saved message id={new_message.id}, chatkit_id={chatkit_id} for conversation {conv_id}")
+                await bulk_insert_messages(session, batch)
         except Exception as e:
-            logging.warning(f"Failed to add message to database: {e}")
+            # Fallback: retry row-by-row so one bad row doesn't drop the batch
+            logger.warning(f"Bulk message flush failed ({e}), retrying rows individually")
+            for row in batch:
+                try:
+                    async with self.session_factory() as session:
+                        await bulk_insert_messages(session, [row])
+                except Exception as row_exc:
+                    logger.warning(f"Dropping message {row.get('id')}: {row_exc}")
+
+    async def aclose(self) -> None:
+        """Stop the flush loop and drain buffered rows (shutdown hook)."""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        else:
+            await self.flush_pending()
 
     async def save_item(
         self,
@@ -622,19 +793,19 @@ class DatabaseStore(Store):
         if not user_id:
             raise ValueError("No user_id in context")
 
-        # Get conversation ID for user isolation check
-        conv_id = await self._get_conversation_id(thread_id, user_id)
-        if not conv_id:
-            raise ValueError(f"Thread {thread_id} not found")
-
         async with self.session_factory() as session:
+            # Get conversation ID for user isolation check
+            conv_id = await self._get_conversation_id(thread_id, user_id, session)
+            if not conv_id:
+                raise ValueError(f"Thread {thread_id} not found")
+
+            # Read-your-writes: drain any buffered inserts before querying
+            await self.flush_pending()
+
             # Search by chatkit_item_id (the preserved ChatKit item ID)
             result = await session.execute(
-                select(Message).where(
-                    Message.chatkit_item_id == item_id,
-                    Message.conversation_id == conv_id,
-                    Message.user_id == user_id
-                )
+                _ITEM_BY_CHATKIT_ID_STMT,
+                {"item_id": item_id, "conv_id": conv_id, "user_id": user_id},
             )
             message = result.scalar_one_or_none()
 
@@ -644,15 +815,15 @@ class DatabaseStore(Store):
                         id=message.chatkit_item_id,  # Use preserved ChatKit ID
                         thread_id=thread_id,
                         created_at=message.created_at,
-                        content=[UserMessageTextContent(type="input_text", text=message.content)],
-                        inference_options={},
+                        content=[UserMessageTextContent(text=message.content)],
+                        inference_options=_EMPTY_INFERENCE_OPTIONS,
                     )
                 else:
                     item = AssistantMessageItem(
                         id=message.chatkit_item_id,  # Use preserved ChatKit ID
                         thread_id=thread_id,
                         created_at=message.created_at,
-                        content=[AssistantMessageContent(type="output_text", text=message.content)],
+                        content=[AssistantMessageContent(text=message.content)],
                     )
                 return item
             raise ValueError(f"Item {item_id} not found")
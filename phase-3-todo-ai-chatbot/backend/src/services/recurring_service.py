@@ -13,9 +13,14 @@ Recurrence patterns supported:
 - yearly: Every N years on the same day
 """
 
-from datetime import date, timedelta
+import calendar
+
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional, Tuple
-from sqlmodel import Session
+from uuid import UUID
+from sqlmodel import Session, select
+from sqlalchemy import bindparam, delete, insert, literal, update
 import uuid
 import logging
 
@@ -23,9 +28,18 @@ from ..models.task import Task, TaskCreate, TaskUpdate, TaskResponse, Recurrence
 from ..models.tag import Tag
 from ..models.task_tag import TaskTag
 from .tag_service import TagService
+from .analytics_service import AnalyticsService
 
 logger = logging.getLogger(__name__)
 
+# Module-level binding saves the attribute lookup on every date calculation.
+_isleap = calendar.isleap
+
+# Days per month (index 0 unused so _MDAYS[month] works directly); February
+# holds the non-leap value and the leap day is added arithmetically, which
+# skips calendar.monthrange's divmod/weekday work entirely.
+_MDAYS = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
 
 # Day name to weekday number mapping (Monday=0, Sunday=6)
 DAY_TO_WEEKDAY = {
@@ -38,6 +52,120 @@ DAY_TO_WEEKDAY = {
     "sun": 6, "sunday": 6,
 }
 
+# Whitespace stripped in one pass by str.translate before splitting, so the
+# per-token .strip() calls disappear from the hot path.
+_DAYS_TRANS = str.maketrans("", "", " \t")
+
+# Sentinel distinguishing "caller didn't precompute next_date" from a
+# precomputed None (which legitimately means the recurrence is exhausted).
+_NEXT_DATE_UNSET: object = object()
+
+
+def _utcnow() -> datetime:
+    """Naive UTC timestamp matching the model layer's storage convention.
+
+    datetime.utcnow() is deprecated since Python 3.12; this is the
+    supported spelling with the tzinfo stripped so values stay comparable
+    to existing naive rows.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@lru_cache(maxsize=512)
+def _days_mask_cached(days_str: str) -> int:
+    """Parse a recurrence_days string into a 7-bit weekday mask (bit 0 = Monday).
+
+    Single pass: each recognized token ORs its bit into the mask, which
+    deduplicates and orders the days for free - no intermediate set, list
+    or sort. Recurrence day strings are highly repetitive ("mon,wed,fri"
+    parsed on every completion of the same task), so the result is memoized.
+    """
+    mask = 0
+    get_weekday = DAY_TO_WEEKDAY.get
+    for token in days_str.lower().translate(_DAYS_TRANS).split(","):
+        weekday = get_weekday(token)
+        if weekday is not None:
+            mask |= 1 << weekday
+    return mask
+
+
+@lru_cache(maxsize=512)
+def _parse_days_cached(days_str: str) -> tuple[int, ...]:
+    """Expand a recurrence_days string into a sorted tuple of weekday numbers.
+
+    Built from the bitmask, so ascending order and uniqueness come from the
+    bit positions themselves. The value is an immutable tuple that can be
+    shared safely between callers.
+    """
+    mask = _days_mask_cached(days_str)
+    return tuple(i for i in range(7) if mask >> i & 1)
+
+
+# Weekly date search precomputed over all 7 x 128 (weekday, day-mask)
+# combinations: _WEEKLY_SAME_WEEK gives the days-to-add to reach a later
+# configured day in the current week (0 = none left this week) and
+# _WEEKLY_FIRST_DAY the lowest configured weekday for the wrap-around case,
+# turning the per-completion scan over the day list into two table lookups.
+_WEEKLY_SAME_WEEK = tuple(
+    tuple(
+        next((d - wd for d in range(wd + 1, 7) if mask >> d & 1), 0)
+        for mask in range(128)
+    )
+    for wd in range(7)
+)
+_WEEKLY_FIRST_DAY = tuple(
+    next((d for d in range(7) if mask >> d & 1), 0) for mask in range(128)
+)
+
+
+def _next_daily(task: "Task", current: date, interval: int) -> date:
+    """Next occurrence for daily recurrence: add N days."""
+    return current + timedelta(days=interval)
+
+
+def _next_weekly(task: "Task", current: date, interval: int) -> date:
+    """Next occurrence for weekly recurrence: add N weeks, or find the next
+    configured day. Prefers the denormalized mask column; falls back to
+    parsing the string for rows written before the mask existed."""
+    days_mask = task.recurrence_days_mask
+    if days_mask is None:
+        days_mask = _days_mask_cached(task.recurrence_days) if task.recurrence_days else 0
+
+    if not days_mask:
+        return current + timedelta(weeks=interval)
+
+    return RecurringService._find_next_weekly_date(current, days_mask, interval)
+
+
+def _next_monthly(task: "Task", current: date, interval: int) -> date:
+    """Next occurrence for monthly recurrence: same day, N months later."""
+    return RecurringService._add_months(current, interval)
+
+
+def _next_yearly(task: "Task", current: date, interval: int) -> date:
+    """Next occurrence for yearly recurrence: same day, N years later."""
+    return RecurringService._add_years(current, interval)
+
+
+# One dict lookup dispatches on recurrence_type instead of walking an
+# if/elif ladder of enum comparisons on every calculation.
+_NEXT_DATE_DISPATCH = {
+    RecurrenceType.daily: _next_daily,
+    RecurrenceType.weekly: _next_weekly,
+    RecurrenceType.monthly: _next_monthly,
+    RecurrenceType.yearly: _next_yearly,
+}
+
+
+# Prepared statement for the tag lookup issued by every complete/skip call.
+# Built once with a bindparam() placeholder so the compiled form (and the
+# server-side prepared statement on PostgreSQL) is reused across requests.
+_TAG_NAMES_STMT = (
+    select(Tag.name)
+    .join(TaskTag, Tag.id == TaskTag.tag_id)
+    .where(TaskTag.task_id == bindparam("task_id"))
+)
+
 
 class RecurringService:
     """
@@ -61,13 +189,66 @@ class RecurringService:
         if not days_str:
             return []
 
-        weekdays = []
-        for day in days_str.lower().split(","):
-            day = day.strip()
-            if day in DAY_TO_WEEKDAY:
-                weekdays.append(DAY_TO_WEEKDAY[day])
+        return list(_parse_days_cached(days_str))
+
+    @staticmethod
+    def days_to_mask(days_str: Optional[str]) -> Optional[int]:
+        """
+        Fold a recurrence_days string into its 7-bit weekday mask.
+
+        Write paths use this to keep the denormalized
+        Task.recurrence_days_mask column in sync with the string, so read
+        paths can use the mask directly instead of re-parsing.
+
+        Args:
+            days_str: Comma-separated day names (e.g., "mon,wed,fri")
+
+        Returns:
+            Mask with bit 0 = Monday ... bit 6 = Sunday, or None if no
+            days are configured
+        """
+        if not days_str:
+            return None
 
-        return sorted(set(weekdays))
+        return _days_mask_cached(days_str)
+
+    @staticmethod
+    def _to_response(task: Task, tag_names: list[str]) -> TaskResponse:
+        """
+        Build a TaskResponse from a Task row and its tag names.
+
+        Every return site in this service previously repeated the same
+        ~20-field TaskResponse literal; one shared helper keeps them in
+        sync and shrinks the per-method bytecode.
+
+        Args:
+            task: Task row to serialize
+            tag_names: Tag names for the response payload
+
+        Returns:
+            TaskResponse for the given task
+        """
+        return TaskResponse(
+            id=task.id,
+            user_id=task.user_id,
+            title=task.title,
+            description=task.description,
+            completed=task.completed,
+            priority=task.priority,
+            due_date=task.due_date,
+            created_at=task.created_at,
+            updated_at=task.updated_at,
+            tags=tag_names,
+            is_recurring=task.is_recurring,
+            is_pattern=task.is_pattern,
+            recurrence_type=task.recurrence_type,
+            recurrence_interval=task.recurrence_interval,
+            recurrence_days=task.recurrence_days,
+            recurrence_end_date=task.recurrence_end_date,
+            max_occurrences=task.max_occurrences,
+            parent_task_id=task.parent_task_id,
+            occurrence_count=task.occurrence_count,
+        )
 
     @staticmethod
     def calculate_next_due_date(task: Task) -> Optional[date]:
@@ -80,67 +261,142 @@ class RecurringService:
         Returns:
             Next due date, or None if recurrence should stop
         """
-        if not task.is_recurring or not task.recurrence_type:
+        # Bind the attributes read more than once to locals; each access on
+        # a SQLModel instance goes through descriptor machinery.
+        recurrence_type = task.recurrence_type
+        if not task.is_recurring or not recurrence_type:
             return None
 
-        if not task.due_date:
-            # No current due date, start from today
-            current_date = date.today()
-        else:
-            current_date = task.due_date
+        # No current due date: start from today
+        current_date = task.due_date or date.today()
+
+        # Every pattern yields a date strictly after current_date, so once
+        # the current date reaches the end date no next occurrence can
+        # exist - skip the date math entirely.
+        recurrence_end_date = task.recurrence_end_date
+        if recurrence_end_date and current_date >= recurrence_end_date:
+            logger.info(
+                f"Task {task.id}: Current date {current_date} has reached end date {recurrence_end_date}"
+            )
+            return None
 
         interval = task.recurrence_interval or 1
+
+        handler = _NEXT_DATE_DISPATCH.get(recurrence_type)
+        if handler is None:
+            return None
+        next_date = handler(task, current_date, interval)
+
+        # Check if next date exceeds end date
+        if next_date and recurrence_end_date:
+            if next_date > recurrence_end_date:
+                logger.info(
+                    f"Task {task.id}: Next date {next_date} exceeds end date {recurrence_end_date}"
+                )
+                return None
+
+        return next_date
+
+    @staticmethod
+    def project_next_dates(task: Task, n: int) -> list[date]:
+        """
+        Project the next N occurrence dates for a recurring task in one pass.
+
+        Equivalent to applying calculate_next_due_date N times, but the
+        recurrence pattern is resolved once up front: daily and plain weekly
+        collapse to stride arithmetic, weekly-with-days walks the week grid
+        directly, and monthly/yearly advance year/month counters instead of
+        re-deriving them from each intermediate date. Intended for "upcoming
+        occurrences" previews (calendar views) where calling the scalar
+        helper in a loop re-parses the pattern every step.
+
+        Args:
+            task: Task with recurrence configuration
+            n: Number of future occurrences to project
+
+        Returns:
+            Up to N future dates in chronological order, truncated at
+            recurrence_end_date; empty if the task does not recur
+        """
+        if n <= 0 or not task.is_recurring or not task.recurrence_type:
+            return []
+
+        current = task.due_date or date.today()
+        interval = task.recurrence_interval or 1
         recurrence_type = task.recurrence_type
 
-        next_date: Optional[date] = None
+        dates: list[date] = []
 
         if recurrence_type == RecurrenceType.daily:
-            # Daily: Add N days
-            next_date = current_date + timedelta(days=interval)
+            step = timedelta(days=interval)
+            dates = [current + step * i for i in range(1, n + 1)]
 
         elif recurrence_type == RecurrenceType.weekly:
-            # Weekly: Add N weeks, or find next specified day
-            recurrence_days = RecurringService.parse_recurrence_days(task.recurrence_days)
+            days = _parse_days_cached(task.recurrence_days) if task.recurrence_days else ()
 
-            if not recurrence_days:
-                # No specific days, just add N weeks
-                next_date = current_date + timedelta(weeks=interval)
+            if not days:
+                step = timedelta(weeks=interval)
+                dates = [current + step * i for i in range(1, n + 1)]
             else:
-                # Find the next occurrence day
-                next_date = RecurringService._find_next_weekly_date(
-                    current_date, recurrence_days, interval
-                )
+                # Walk the week grid: remaining days in the current week,
+                # then every interval-th week with all configured days.
+                stride = 7 * interval
+                current_ord = current.toordinal()
+                week_start = current_ord - current.weekday()
+                while len(dates) < n:
+                    for day in days:
+                        day_ord = week_start + day
+                        if day_ord > current_ord:
+                            dates.append(date.fromordinal(day_ord))
+                            if len(dates) == n:
+                                break
+                    week_start += stride
 
         elif recurrence_type == RecurrenceType.monthly:
-            # Monthly: Same day, N months later
-            next_date = RecurringService._add_months(current_date, interval)
-
-        elif recurrence_type == RecurrenceType.yearly:
-            # Yearly: Same day, N years later
-            next_date = RecurringService._add_years(current_date, interval)
-
-        # Check if next date exceeds end date
-        if next_date and task.recurrence_end_date:
-            if next_date > task.recurrence_end_date:
-                logger.info(
-                    f"Task {task.id}: Next date {next_date} exceeds end date {task.recurrence_end_date}"
-                )
-                return None
-
-        return next_date
+            # Clamp progressively like the iterative path does: once the day
+            # overflows a short month it stays clamped (Jan 31 -> Feb 28 -> Mar 28).
+            year, month, day = current.year, current.month, current.day
+            for _ in range(n):
+                month += interval
+                year += (month - 1) // 12
+                month = (month - 1) % 12 + 1
+                max_day = _MDAYS[month] + (month == 2 and _isleap(year))
+                if day > max_day:
+                    day = max_day
+                dates.append(date(year, month, day))
+
+        else:  # yearly
+            year, month, day = current.year, current.month, current.day
+            for _ in range(n):
+                year += interval
+                # Feb 29 clamps to 28 on the first non-leap year and stays
+                # there, matching repeated _add_years application.
+                if month == 2 and day == 29 and not _isleap(year):
+                    day = 28
+                dates.append(date(year, month, day))
+
+        end_date = task.recurrence_end_date
+        if end_date:
+            dates = [d for d in dates if d <= end_date]
+
+        return dates
 
     @staticmethod
     def _find_next_weekly_date(
         current_date: date,
-        recurrence_days: list[int],
+        days_mask: int,
         interval: int
     ) -> date:
         """
         Find the next occurrence date for weekly recurrence with specific days.
 
+        Both decisions - "later day in the same week?" and "first day of the
+        next interval week" - are lookups into tables precomputed at import
+        over every (weekday, mask) pair, so no per-call scan of the day list.
+
         Args:
             current_date: Current due date
-            recurrence_days: List of weekday numbers (0=Monday)
+            days_mask: 7-bit mask of active weekdays (bit 0 = Monday)
             interval: Number of weeks between occurrences
 
         Returns:
@@ -149,18 +405,13 @@ class RecurringService:
         current_weekday = current_date.weekday()
 
         # First, check if there's a later day in the same week
-        for day in recurrence_days:
-            if day > current_weekday:
-                return current_date + timedelta(days=(day - current_weekday))
-
-        # Otherwise, go to the first day of the next interval week
-        days_to_next_monday = 7 - current_weekday
-        days_to_skip = days_to_next_monday + (interval - 1) * 7
-        next_week_start = current_date + timedelta(days=days_to_skip)
+        offset = _WEEKLY_SAME_WEEK[current_weekday][days_mask]
+        if offset:
+            return current_date + timedelta(days=offset)
 
-        # Find the first recurrence day in that week
-        first_day = min(recurrence_days)
-        return next_week_start + timedelta(days=first_day)
+        # Otherwise, go to the first recurrence day of the next interval week
+        days_to_skip = 7 - current_weekday + (interval - 1) * 7
+        return current_date + timedelta(days=days_to_skip + _WEEKLY_FIRST_DAY[days_mask])
 
     @staticmethod
     def _add_months(d: date, months: int) -> date:
@@ -178,9 +429,8 @@ class RecurringService:
         new_year = d.year + (new_month - 1) // 12
         new_month = (new_month - 1) % 12 + 1
 
-        # Handle day overflow (e.g., Jan 31 + 1 month)
-        import calendar
-        max_day = calendar.monthrange(new_year, new_month)[1]
+        # Handle day overflow (e.g., Jan 31 + 1 month); bool adds the leap day
+        max_day = _MDAYS[new_month] + (new_month == 2 and _isleap(new_year))
         new_day = min(d.day, max_day)
 
         return date(new_year, new_month, new_day)
@@ -200,21 +450,27 @@ class RecurringService:
         new_year = d.year + years
 
         # Handle Feb 29 on non-leap years
-        import calendar
         if d.month == 2 and d.day == 29:
-            if not calendar.isleap(new_year):
+            if not _isleap(new_year):
                 return date(new_year, 2, 28)
 
         return date(new_year, d.month, d.day)
 
     @staticmethod
-    def should_generate_next(task: Task, session: Optional[Session] = None) -> bool:
+    def should_generate_next(
+        task: Task,
+        session: Optional[Session] = None,
+        next_date: object = _NEXT_DATE_UNSET,
+    ) -> bool:
         """
         Check if the next occurrence should be generated.
 
         Args:
             task: Task to check
             session: Database session (needed to check parent's occurrence_count)
+            next_date: Precomputed result of calculate_next_due_date, so callers
+                that already derived the next date don't pay for the date
+                arithmetic twice; omit to compute it here
 
         Returns:
             True if next occurrence should be generated
@@ -227,26 +483,29 @@ class RecurringService:
         # occurrence_count = number of times we've generated a new instance
         # So if max_occurrences=3, we want: original + 2 generated = 3 total
         # We should stop when occurrence_count >= max_occurrences - 1
-        if task.max_occurrences is not None:
+        max_occurrences = task.max_occurrences
+        if max_occurrences is not None:
             # Get the actual occurrence count from the parent task
             # If this is an instance, get from parent; if this is parent, use own count
             occurrence_count = task.occurrence_count
-            if task.parent_task_id and session:
-                parent_task = session.get(Task, task.parent_task_id)
+            parent_task_id = task.parent_task_id
+            if parent_task_id and session:
+                parent_task = session.get(Task, parent_task_id)
                 if parent_task:
                     occurrence_count = parent_task.occurrence_count
 
             # Stop if we've already generated (max_occurrences - 1) instances
             # because original + (max-1) generated = max total tasks
-            if occurrence_count >= task.max_occurrences - 1:
+            if occurrence_count >= max_occurrences - 1:
                 logger.info(
-                    f"Task {task.id}: Max occurrences ({task.max_occurrences}) reached "
-                    f"(generated count: {occurrence_count}, max-1={task.max_occurrences - 1})"
+                    f"Task {task.id}: Max occurrences ({max_occurrences}) reached "
+                    f"(generated count: {occurrence_count}, max-1={max_occurrences - 1})"
                 )
                 return False
 
-        # Check end date
-        next_date = RecurringService.calculate_next_due_date(task)
+        # Check end date (reuse the caller's precomputed value when provided)
+        if next_date is _NEXT_DATE_UNSET:
+            next_date = RecurringService.calculate_next_due_date(task)
         if next_date is None:
             return False
 
@@ -275,10 +534,10 @@ class RecurringService:
         Returns:
             New TaskResponse if generated, None if recurrence complete
         """
-        if not RecurringService.should_generate_next(task, session):
+        next_due_date = RecurringService.calculate_next_due_date(task)
+        if not RecurringService.should_generate_next(task, session, next_due_date):
             return None
 
-        next_due_date = RecurringService.calculate_next_due_date(task)
         if not next_due_date:
             return None
 
@@ -287,40 +546,52 @@ class RecurringService:
             # If this task has a parent, use that; otherwise this is the parent
             parent_id = task.parent_task_id if task.parent_task_id else task.id
 
-            # Create new task instance
-            new_task = Task(
-                user_id=user_id,
-                title=task.title,
-                description=task.description,
-                completed=False,
-                priority=task.priority,
-                due_date=next_due_date,
+            # Create new task instance with a Core insert - skips the ORM
+            # unit-of-work/instrumentation cost and the flush round-trip.
+            # id/timestamps are supplied explicitly because their defaults
+            # live in the model layer, not the database schema.
+            now = _utcnow()
+            new_values = {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "title": task.title,
+                "description": task.description,
+                "completed": False,
+                "priority": task.priority,
+                "due_date": next_due_date,
                 # Copy recurrence configuration
-                is_recurring=True,
-                is_pattern=False,  # Instances are never patterns
-                recurrence_type=task.recurrence_type,
-                recurrence_interval=task.recurrence_interval,
-                recurrence_days=task.recurrence_days,
-                recurrence_end_date=task.recurrence_end_date,
-                max_occurrences=task.max_occurrences,
-                parent_task_id=parent_id,
-                occurrence_count=0,  # Instance count, not pattern count
+                "is_recurring": True,
+                "is_pattern": False,  # Instances are never patterns
+                "recurrence_type": task.recurrence_type,
+                "recurrence_interval": task.recurrence_interval,
+                "recurrence_days": task.recurrence_days,
+                "recurrence_days_mask": RecurringService.days_to_mask(task.recurrence_days),
+                "recurrence_end_date": task.recurrence_end_date,
+                "max_occurrences": task.max_occurrences,
+                "parent_task_id": parent_id,
+                "occurrence_count": 0,  # Instance count, not pattern count
+                "created_at": now,
+                "updated_at": now,
+            }
+            session.execute(insert(Task).values(new_values))
+
+            # Copy tags from original task server-side: INSERT ... SELECT
+            # keeps the tag ids in the database instead of fetching them
+            # just to send them straight back
+            session.execute(
+                insert(TaskTag).from_select(
+                    ["task_id", "tag_id"],
+                    select(
+                        literal(new_values["id"], type_=TaskTag.__table__.c.task_id.type),
+                        TaskTag.tag_id,
+                    ).where(TaskTag.task_id == task.id),
+                )
             )
 
-            session.add(new_task)
-            session.flush()  # Get new_task.id
-
-            # Copy tags from original task
-            tag_query = (
-                session.query(Tag.id, Tag.name)
-                .join(TaskTag, Tag.id == TaskTag.tag_id)
-                .filter(TaskTag.task_id == task.id)
+            # Names are only needed for the response payload
+            tag_names = list(
+                session.exec(_TAG_NAMES_STMT, params={"task_id": task.id}).all()
             )
-            tag_names = []
-            for tag_id, tag_name in tag_query.all():
-                task_tag = TaskTag(task_id=new_task.id, tag_id=tag_id)
-                session.add(task_tag)
-                tag_names.append(tag_name)
 
             # Increment occurrence count on the parent task
             if task.parent_task_id:
@@ -335,35 +606,16 @@ class RecurringService:
                 session.add(task)
 
             session.commit()
-            session.refresh(new_task)
+            AnalyticsService.invalidate_user(user_id)
 
             logger.info(
                 f"Generated next occurrence for task {task.id}: "
-                f"new task {new_task.id} with due date {next_due_date}"
+                f"new task {new_values['id']} with due date {next_due_date}"
             )
 
-            # Build response
-            return TaskResponse(
-                id=new_task.id,
-                user_id=new_task.user_id,
-                title=new_task.title,
-                description=new_task.description,
-                completed=new_task.completed,
-                priority=new_task.priority,
-                due_date=new_task.due_date,
-                created_at=new_task.created_at,
-                updated_at=new_task.updated_at,
-                tags=tag_names,
-                is_recurring=new_task.is_recurring,
-                is_pattern=new_task.is_pattern,
-                recurrence_type=new_task.recurrence_type,
-                recurrence_interval=new_task.recurrence_interval,
-                recurrence_days=new_task.recurrence_days,
-                recurrence_end_date=new_task.recurrence_end_date,
-                max_occurrences=new_task.max_occurrences,
-                parent_task_id=new_task.parent_task_id,
-                occurrence_count=new_task.occurrence_count,
-            )
+            # Build response from the inserted values - no refresh needed,
+            # every column was supplied client-side
+            return TaskResponse(**new_values, tags=tag_names)
 
         except Exception as e:
             session.rollback()
@@ -394,65 +646,51 @@ class RecurringService:
             Tuple of (completed task response, next occurrence response or None)
             Note: In Todoist-style, both responses refer to the SAME task
         """
-        from sqlmodel import select
-        from datetime import datetime
-
         try:
-            # Get tags for the task
-            tag_query = (
-                select(Tag.name)
-                .join(TaskTag, Tag.id == TaskTag.tag_id)
-                .where(TaskTag.task_id == task.id)
+            # Get tags for the task (prepared statement, see _TAG_NAMES_STMT)
+            tag_names = list(
+                session.exec(_TAG_NAMES_STMT, params={"task_id": task.id}).all()
             )
-            tag_names = list(session.exec(tag_query).all())
 
             if task.is_recurring:
                 # TODOIST-STYLE: Shift due_date instead of creating new instance
                 logger.info(f"Todoist-style: Completing recurring task {task.id}, shifting due_date")
 
-                # Calculate next due date
+                # Calculate next due date once; should_generate_next reuses it
                 next_due_date = RecurringService.calculate_next_due_date(task)
 
                 # Check if we should continue recurring
-                should_continue = RecurringService.should_generate_next(task, session)
+                should_continue = RecurringService.should_generate_next(task, session, next_due_date)
 
                 if should_continue and next_due_date:
-                    # Shift due_date to next occurrence (keep task active)
+                    # Shift due_date to next occurrence (keep task active).
+                    # One Core UPDATE instead of ORM flush + refresh SELECT;
+                    # occurrence_count is incremented in SQL so concurrent
+                    # completions can't lose an update.
                     old_due_date = task.due_date
-                    task.due_date = next_due_date
-                    task.completed = False  # Reset to pending for next occurrence
-                    task.occurrence_count += 1  # Track total completions
-                    task.updated_at = datetime.utcnow()
-                    session.add(task)
+                    now = _utcnow()
+                    session.execute(
+                        update(Task)
+                        .where(Task.id == task.id, Task.user_id == user_id)
+                        .values(
+                            due_date=next_due_date,
+                            completed=False,  # Reset to pending for next occurrence
+                            occurrence_count=Task.occurrence_count + 1,
+                            updated_at=now,
+                        )
+                    )
+
+                    # The ORM-enabled UPDATE synchronizes the in-session
+                    # instance, so the response can be built before the commit
+                    # expires it - no refresh SELECT needed
+                    task_response = RecurringService._to_response(task, tag_names)
+
                     session.commit()
-                    session.refresh(task)
+                    AnalyticsService.invalidate_user(user_id)
 
                     logger.info(
-                        f"Task {task.id}: Shifted due_date from {old_due_date} to {next_due_date}, "
-                        f"occurrence #{task.occurrence_count}"
-                    )
-
-                    # Build response - same task with new due_date
-                    task_response = TaskResponse(
-                        id=task.id,
-                        user_id=task.user_id,
-                        title=task.title,
-                        description=task.description,
-                        completed=task.completed,
-                        priority=task.priority,
-                        due_date=task.due_date,
-                        created_at=task.created_at,
-                        updated_at=task.updated_at,
-                        tags=tag_names,
-                        is_recurring=task.is_recurring,
-                        is_pattern=task.is_pattern,
-                        recurrence_type=task.recurrence_type,
-                        recurrence_interval=task.recurrence_interval,
-                        recurrence_days=task.recurrence_days,
-                        recurrence_end_date=task.recurrence_end_date,
-                        max_occurrences=task.max_occurrences,
-                        parent_task_id=task.parent_task_id,
-                        occurrence_count=task.occurrence_count,
+                        f"Task {task_response.id}: Shifted due_date from {old_due_date} to {next_due_date}, "
+                        f"occurrence #{task_response.occurrence_count}"
                     )
 
                     # Return same task for both (Todoist-style: single task model)
@@ -462,69 +700,40 @@ class RecurringService:
                     # Recurrence ended (max_occurrences or end_date reached)
                     # Mark as completed and stop recurrence
                     logger.info(f"Task {task.id}: Recurrence ended, marking as completed")
-                    task.completed = True
-                    task.is_recurring = False  # Stop future recurrence
-                    task.occurrence_count += 1
-                    task.updated_at = datetime.utcnow()
-                    session.add(task)
-                    session.commit()
-                    session.refresh(task)
-
-                    completed_response = TaskResponse(
-                        id=task.id,
-                        user_id=task.user_id,
-                        title=task.title,
-                        description=task.description,
-                        completed=task.completed,
-                        priority=task.priority,
-                        due_date=task.due_date,
-                        created_at=task.created_at,
-                        updated_at=task.updated_at,
-                        tags=tag_names,
-                        is_recurring=task.is_recurring,
-                        is_pattern=task.is_pattern,
-                        recurrence_type=task.recurrence_type,
-                        recurrence_interval=task.recurrence_interval,
-                        recurrence_days=task.recurrence_days,
-                        recurrence_end_date=task.recurrence_end_date,
-                        max_occurrences=task.max_occurrences,
-                        parent_task_id=task.parent_task_id,
-                        occurrence_count=task.occurrence_count,
+                    now = _utcnow()
+                    session.execute(
+                        update(Task)
+                        .where(Task.id == task.id, Task.user_id == user_id)
+                        .values(
+                            completed=True,
+                            is_recurring=False,  # Stop future recurrence
+                            occurrence_count=Task.occurrence_count + 1,
+                            updated_at=now,
+                        )
                     )
 
+                    completed_response = RecurringService._to_response(task, tag_names)
+
+                    session.commit()
+                    AnalyticsService.invalidate_user(user_id)
+
                     return completed_response, None
 
             else:
                 # Non-recurring task: just mark as completed
                 logger.info(f"Completing non-recurring task {task.id}")
-                task.completed = True
-                task.updated_at = datetime.utcnow()
-                session.add(task)
-                session.commit()
-                session.refresh(task)
-
-                completed_response = TaskResponse(
-                    id=task.id,
-                    user_id=task.user_id,
-                    title=task.title,
-                    description=task.description,
-                    completed=task.completed,
-                    priority=task.priority,
-                    due_date=task.due_date,
-                    created_at=task.created_at,
-                    updated_at=task.updated_at,
-                    tags=tag_names,
-                    is_recurring=task.is_recurring,
-                    is_pattern=task.is_pattern,
-                    recurrence_type=task.recurrence_type,
-                    recurrence_interval=task.recurrence_interval,
-                    recurrence_days=task.recurrence_days,
-                    recurrence_end_date=task.recurrence_end_date,
-                    max_occurrences=task.max_occurrences,
-                    parent_task_id=task.parent_task_id,
-                    occurrence_count=task.occurrence_count,
+                now = _utcnow()
+                session.execute(
+                    update(Task)
+                    .where(Task.id == task.id, Task.user_id == user_id)
+                    .values(completed=True, updated_at=now)
                 )
 
+                completed_response = RecurringService._to_response(task, tag_names)
+
+                session.commit()
+                AnalyticsService.invalidate_user(user_id)
+
                 return completed_response, None
 
         except Exception as e:
@@ -552,120 +761,66 @@ class RecurringService:
         Returns:
             Tuple of (skipped task response, next occurrence response or None)
         """
-        from sqlmodel import select
-        from datetime import datetime
-
         try:
-            # Get tags for the task
-            tag_query = (
-                select(Tag.name)
-                .join(TaskTag, Tag.id == TaskTag.tag_id)
-                .where(TaskTag.task_id == task.id)
+            # Get tags for the task (prepared statement, see _TAG_NAMES_STMT)
+            tag_names = list(
+                session.exec(_TAG_NAMES_STMT, params={"task_id": task.id}).all()
             )
-            tag_names = list(session.exec(tag_query).all())
 
             if task.is_recurring:
                 # TODOIST-STYLE: Just shift due_date (don't mark completed)
                 next_due_date = RecurringService.calculate_next_due_date(task)
-                should_continue = RecurringService.should_generate_next(task, session)
+                should_continue = RecurringService.should_generate_next(task, session, next_due_date)
 
                 if should_continue and next_due_date:
-                    old_due_date = task.due_date
-                    task.due_date = next_due_date
+                    # One Core UPDATE instead of ORM flush + refresh SELECT.
                     # Don't increment occurrence_count for skips (wasn't completed)
-                    task.updated_at = datetime.utcnow()
-                    session.add(task)
-                    session.commit()
-                    session.refresh(task)
-
-                    logger.info(f"Skipped task {task.id}: shifted due_date from {old_due_date} to {next_due_date}")
-
-                    task_response = TaskResponse(
-                        id=task.id,
-                        user_id=task.user_id,
-                        title=task.title,
-                        description=task.description,
-                        completed=task.completed,
-                        priority=task.priority,
-                        due_date=task.due_date,
-                        created_at=task.created_at,
-                        updated_at=task.updated_at,
-                        tags=tag_names,
-                        is_recurring=task.is_recurring,
-                        is_pattern=task.is_pattern,
-                        recurrence_type=task.recurrence_type,
-                        recurrence_interval=task.recurrence_interval,
-                        recurrence_days=task.recurrence_days,
-                        recurrence_end_date=task.recurrence_end_date,
-                        max_occurrences=task.max_occurrences,
-                        parent_task_id=task.parent_task_id,
-                        occurrence_count=task.occurrence_count,
+                    old_due_date = task.due_date
+                    now = _utcnow()
+                    session.execute(
+                        update(Task)
+                        .where(Task.id == task.id, Task.user_id == user_id)
+                        .values(due_date=next_due_date, updated_at=now)
                     )
 
+                    task_response = RecurringService._to_response(task, tag_names)
+
+                    session.commit()
+                    AnalyticsService.invalidate_user(user_id)
+
+                    logger.info(f"Skipped task {task_response.id}: shifted due_date from {old_due_date} to {next_due_date}")
+
                     return task_response, task_response
                 else:
                     # Recurrence ended
                     logger.info(f"Skip: Task {task.id} recurrence ended")
-                    task.completed = True
-                    task.is_recurring = False
-                    task.updated_at = datetime.utcnow()
-                    session.add(task)
-                    session.commit()
-                    session.refresh(task)
-
-                    task_response = TaskResponse(
-                        id=task.id,
-                        user_id=task.user_id,
-                        title=task.title,
-                        description=task.description,
-                        completed=task.completed,
-                        priority=task.priority,
-                        due_date=task.due_date,
-                        created_at=task.created_at,
-                        updated_at=task.updated_at,
-                        tags=tag_names,
-                        is_recurring=task.is_recurring,
-                        is_pattern=task.is_pattern,
-                        recurrence_type=task.recurrence_type,
-                        recurrence_interval=task.recurrence_interval,
-                        recurrence_days=task.recurrence_days,
-                        recurrence_end_date=task.recurrence_end_date,
-                        max_occurrences=task.max_occurrences,
-                        parent_task_id=task.parent_task_id,
-                        occurrence_count=task.occurrence_count,
+                    now = _utcnow()
+                    session.execute(
+                        update(Task)
+                        .where(Task.id == task.id, Task.user_id == user_id)
+                        .values(completed=True, is_recurring=False, updated_at=now)
                     )
 
+                    task_response = RecurringService._to_response(task, tag_names)
+
+                    session.commit()
+                    AnalyticsService.invalidate_user(user_id)
+
                     return task_response, None
             else:
                 # Non-recurring task: just mark as completed
-                task.completed = True
-                task.updated_at = datetime.utcnow()
-                session.add(task)
-                session.commit()
-                session.refresh(task)
-
-                task_response = TaskResponse(
-                    id=task.id,
-                    user_id=task.user_id,
-                    title=task.title,
-                    description=task.description,
-                    completed=task.completed,
-                    priority=task.priority,
-                    due_date=task.due_date,
-                    created_at=task.created_at,
-                    updated_at=task.updated_at,
-                    tags=tag_names,
-                    is_recurring=task.is_recurring,
-                    is_pattern=task.is_pattern,
-                    recurrence_type=task.recurrence_type,
-                    recurrence_interval=task.recurrence_interval,
-                    recurrence_days=task.recurrence_days,
-                    recurrence_end_date=task.recurrence_end_date,
-                    max_occurrences=task.max_occurrences,
-                    parent_task_id=task.parent_task_id,
-                    occurrence_count=task.occurrence_count,
+                now = _utcnow()
+                session.execute(
+                    update(Task)
+                    .where(Task.id == task.id, Task.user_id == user_id)
+                    .values(completed=True, updated_at=now)
                 )
 
+                task_response = RecurringService._to_response(task, tag_names)
+
+                session.commit()
+                AnalyticsService.invalidate_user(user_id)
+
                 return task_response, None
 
         except Exception as e:
@@ -673,6 +828,94 @@ class RecurringService:
             logger.error(f"Error skipping task {task.id}: {e}")
             raise
 
+    @staticmethod
+    def skip_occurrence_by_id(
+        session: Session,
+        task_id: UUID,
+        user_id: str
+    ) -> Optional[Tuple[TaskResponse, Optional[TaskResponse]]]:
+        """
+        Skip a task occurrence, resolving the task inside the service.
+
+        Performs the user-scoped lookup itself so endpoints don't need a
+        separate get_task_by_id round-trip before calling skip_occurrence.
+        The skip computation needs the current row to derive the next due
+        date, so one SELECT is unavoidable - but only one.
+
+        Args:
+            session: Database session
+            task_id: Task UUID
+            user_id: User ID for security validation
+
+        Returns:
+            Same tuple as skip_occurrence, or None if the task doesn't
+            exist or belongs to another user
+        """
+        from .task_service import TaskService
+
+        task = TaskService.get_task_by_id(session, task_id, user_id)
+        if task is None:
+            return None
+
+        return RecurringService.skip_occurrence(session, task, user_id)
+
+    @staticmethod
+    def stop_recurrence_by_id(
+        session: Session,
+        task_id: UUID,
+        user_id: str
+    ) -> Optional[TaskResponse]:
+        """
+        Stop recurrence with a single UPDATE ... RETURNING round-trip.
+
+        Combines the ownership check and the write into one statement
+        (UPDATE ... WHERE id = :id AND user_id = :uid RETURNING *), so
+        endpoints don't need a separate get_task_by_id SELECT first and
+        no post-commit refresh is required.
+
+        Args:
+            session: Database session
+            task_id: Task UUID
+            user_id: User ID for security validation
+
+        Returns:
+            Updated TaskResponse, or None if the task doesn't exist or
+            belongs to another user
+        """
+        try:
+            stmt = (
+                update(Task)
+                .where(Task.id == task_id, Task.user_id == user_id)
+                .values(is_recurring=False)
+                .returning(Task)
+            )
+            task = session.execute(stmt).scalars().first()
+
+            if task is None:
+                logger.info(f"Stop recurrence: task {task_id} not found for user {user_id}")
+                return None
+
+            # Get tags for the task (prepared statement, see _TAG_NAMES_STMT)
+            tag_names = list(
+                session.exec(_TAG_NAMES_STMT, params={"task_id": task_id}).all()
+            )
+
+            # Build the response before commit expires the RETURNING
+            # instance, matching the other write paths in this service
+            task_response = RecurringService._to_response(task, tag_names)
+
+            session.commit()
+            AnalyticsService.invalidate_user(user_id)
+
+            logger.info(f"Stopped recurrence for task {task_id}")
+
+            return task_response
+
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error stopping recurrence for task {task_id}: {e}")
+            raise
+
     @staticmethod
     def stop_recurrence(
         session: Session,
@@ -708,33 +951,18 @@ class RecurringService:
             )
             tag_names = list(session.exec(tag_query).all())
 
+            # Flush so the updated_at onupdate fires, then build the
+            # response before commit expires the instance; no refresh
+            # round-trip needed.
+            session.flush()
+            task_response = RecurringService._to_response(task, tag_names)
+
             session.commit()
-            session.refresh(task)
-
-            logger.info(f"Stopped recurrence for task {task.id}")
-
-            # Build response
-            return TaskResponse(
-                id=task.id,
-                user_id=task.user_id,
-                title=task.title,
-                description=task.description,
-                completed=task.completed,
-                priority=task.priority,
-                due_date=task.due_date,
-                created_at=task.created_at,
-                updated_at=task.updated_at,
-                tags=tag_names,
-                is_recurring=task.is_recurring,
-                is_pattern=task.is_pattern,
-                recurrence_type=task.recurrence_type,
-                recurrence_interval=task.recurrence_interval,
-                recurrence_days=task.recurrence_days,
-                recurrence_end_date=task.recurrence_end_date,
-                max_occurrences=task.max_occurrences,
-                parent_task_id=task.parent_task_id,
-                occurrence_count=task.occurrence_count,
-            )
+            AnalyticsService.invalidate_user(user_id)
+
+            logger.info(f"Stopped recurrence for task {task_response.id}")
+
+            return task_response
 
         except Exception as e:
             session.rollback()
@@ -767,9 +995,6 @@ class RecurringService:
         Returns:
             TaskResponse of the updated task
         """
-        from sqlmodel import select
-        from datetime import datetime
-
         try:
             # Determine the parent task ID for finding all instances
             if task.parent_task_id:
@@ -779,8 +1004,8 @@ class RecurringService:
                 # This is the parent
                 parent_id = task.id
 
-            # Get all uncompleted tasks in the series (parent + instances)
-            series_query = select(Task).where(
+            # All uncompleted tasks in the series (parent + instances)
+            series_filter = (
                 (Task.user_id == user_id) &
                 (Task.completed == False) &
                 (
@@ -788,73 +1013,68 @@ class RecurringService:
                     (Task.parent_task_id == parent_id)
                 )
             )
-            series_tasks = list(session.exec(series_query).all())
 
             # Prepare update data (exclude tags which need special handling)
             update_data = task_update.model_dump(exclude_unset=True, exclude={"tags"})
+            if "recurrence_days" in update_data:
+                update_data["recurrence_days_mask"] = RecurringService.days_to_mask(
+                    update_data["recurrence_days"]
+                )
 
-            # Update all tasks in series
-            for series_task in series_tasks:
-                for field, value in update_data.items():
-                    setattr(series_task, field, value)
-                series_task.updated_at = datetime.utcnow()
-                session.add(series_task)
+            # Tag rewrite needs the member ids; snapshot them before the
+            # bulk update in case it flips completed on the series
+            series_ids: list = []
+            if task_update.tags is not None:
+                series_ids = list(session.exec(select(Task.id).where(series_filter)).all())
+
+            # One set-level UPDATE for the whole series instead of loading
+            # each instance into the session just to mutate fields
+            updated_count = 0
+            if update_data:
+                update_data["updated_at"] = _utcnow()
+                result = session.execute(
+                    update(Task).where(series_filter).values(**update_data)
+                )
+                updated_count = result.rowcount or 0
 
             # Handle tags update if provided
             tag_names = []
             if task_update.tags is not None:
-                for series_task in series_tasks:
-                    # Delete existing tag associations
-                    delete_stmt = select(TaskTag).where(TaskTag.task_id == series_task.id)
-                    existing_task_tags = session.exec(delete_stmt).all()
-                    for task_tag in existing_task_tags:
-                        session.delete(task_tag)
-
-                    # Create new tag associations
-                    for tag_name in task_update.tags:
-                        tag = TagService.create_or_get_tag(session, user_id, tag_name)
-                        if series_task.id == task.id:
-                            tag_names.append(tag.name)
-                        task_tag = TaskTag(task_id=series_task.id, tag_id=tag.id)
-                        session.add(task_tag)
+                # Replace associations for the whole series: one DELETE plus
+                # one bulk INSERT instead of per-task row churn
+                session.execute(
+                    delete(TaskTag).where(TaskTag.task_id.in_(series_ids))
+                )
+                tags_by_name = TagService.get_or_create_tags_bulk(
+                    session, user_id, task_update.tags
+                )
+                tag_rows = []
+                for tag in tags_by_name.values():
+                    tag_names.append(tag.name)
+                    tag_rows.extend(
+                        {"task_id": series_id, "tag_id": tag.id}
+                        for series_id in series_ids
+                    )
+                if tag_rows:
+                    session.execute(insert(TaskTag), tag_rows)
             else:
                 # Tags not being updated, get existing tags for response
-                tag_query = (
-                    select(Tag.name)
-                    .join(TaskTag, Tag.id == TaskTag.tag_id)
-                    .where(TaskTag.task_id == task.id)
+                tag_names = list(
+                    session.exec(_TAG_NAMES_STMT, params={"task_id": task.id}).all()
                 )
-                tag_names = list(session.exec(tag_query).all())
+
+            # The ORM-enabled UPDATE synchronized the in-session task, so the
+            # response is built before commit - no refresh SELECT
+            response = RecurringService._to_response(task, tag_names)
 
             session.commit()
-            session.refresh(task)
+            AnalyticsService.invalidate_user(user_id)
 
             logger.info(
-                f"Updated {len(series_tasks)} tasks in series for parent {parent_id}"
+                f"Updated {updated_count} tasks in series for parent {parent_id}"
             )
 
-            # Build response for the originally requested task
-            return TaskResponse(
-                id=task.id,
-                user_id=task.user_id,
-                title=task.title,
-                description=task.description,
-                completed=task.completed,
-                priority=task.priority,
-                due_date=task.due_date,
-                created_at=task.created_at,
-                updated_at=task.updated_at,
-                tags=tag_names,
-                is_recurring=task.is_recurring,
-                is_pattern=task.is_pattern,
-                recurrence_type=task.recurrence_type,
-                recurrence_interval=task.recurrence_interval,
-                recurrence_days=task.recurrence_days,
-                recurrence_end_date=task.recurrence_end_date,
-                max_occurrences=task.max_occurrences,
-                parent_task_id=task.parent_task_id,
-                occurrence_count=task.occurrence_count,
-            )
+            return response
 
         except Exception as e:
             session.rollback()
@@ -62,6 +62,35 @@ class TagService:
             for name, count in results
         ]
 
+    @staticmethod
+    def _validate_tag_name(tag_name: str) -> str:
+        """
+        Validate and normalize a tag name.
+
+        T051: length 1-50 chars, alphanumeric + spaces/hyphens/underscores.
+
+        Args:
+            tag_name: Raw tag name from the request
+
+        Returns:
+            The stripped tag name
+
+        Raises:
+            ValueError: If tag name validation fails
+        """
+        tag_name = tag_name.strip()
+
+        # Check length
+        if not tag_name or len(tag_name) > 50:
+            raise ValueError("Tag name must be 1-50 characters")
+
+        # Check allowed characters: alphanumeric, spaces, hyphens, and underscores
+        # Pattern: at least one alphanumeric character, can contain spaces/hyphens
+        if not re.match(r'^[a-zA-Z0-9][a-zA-Z0-9\s\-_]*$', tag_name):
+            raise ValueError("Tag name must contain only alphanumeric characters, spaces, hyphens, and underscores")
+
+        return tag_name
+
     @staticmethod
     def create_or_get_tag(
         session: Session,
@@ -83,17 +112,7 @@ class TagService:
         Raises:
             ValueError: If tag name validation fails
         """
-        # T051: Validate tag name (length 1-50 chars, alphanumeric + spaces/hyphens)
-        tag_name = tag_name.strip()
-
-        # Check length
-        if not tag_name or len(tag_name) > 50:
-            raise ValueError("Tag name must be 1-50 characters")
-
-        # Check allowed characters: alphanumeric, spaces, hyphens, and underscores
-        # Pattern: at least one alphanumeric character, can contain spaces/hyphens
-        if not re.match(r'^[a-zA-Z0-9][a-zA-Z0-9\s\-_]*$', tag_name):
-            raise ValueError("Tag name must contain only alphanumeric characters, spaces, hyphens, and underscores")
+        tag_name = TagService._validate_tag_name(tag_name)
 
         # Try to find existing tag
         statement = select(Tag).where(
@@ -114,3 +133,55 @@ class TagService:
         session.flush()  # Get the ID without committing
 
         return new_tag
+
+    @staticmethod
+    def get_or_create_tags_bulk(
+        session: Session,
+        user_id: str,
+        tag_names: List[str]
+    ) -> dict[str, Tag]:
+        """
+        Resolve a list of tag names to Tag objects in two round trips.
+
+        Looking tags up one at a time costs a SELECT per name (N+1); this
+        fetches every existing tag with a single IN query and creates all
+        missing ones in one flush, so resolving K tags takes 2 statements
+        instead of K. Duplicate names are collapsed; order is preserved.
+
+        Args:
+            session: Database session
+            user_id: Better Auth user ID
+            tag_names: Tag names to create or retrieve
+
+        Returns:
+            Dict mapping validated tag name -> Tag, in request order
+
+        Raises:
+            ValueError: If any tag name fails validation
+        """
+        validated: List[str] = []
+        seen: set[str] = set()
+        for tag_name in tag_names:
+            tag_name = TagService._validate_tag_name(tag_name)
+            if tag_name not in seen:
+                seen.add(tag_name)
+                validated.append(tag_name)
+
+        if not validated:
+            return {}
+
+        statement = select(Tag).where(
+            Tag.user_id == user_id,
+            Tag.name.in_(validated)
+        )
+        tags_by_name = {tag.name: tag for tag in session.exec(statement).all()}
+
+        missing = [name for name in validated if name not in tags_by_name]
+        if missing:
+            new_tags = [Tag(user_id=user_id, name=name) for name in missing]
+            session.add_all(new_tags)
+            session.flush()  # One batched INSERT; ids assigned client-side
+            for tag in new_tags:
+                tags_by_name[tag.name] = tag
+
+        return {name: tags_by_name[name] for name in validated}
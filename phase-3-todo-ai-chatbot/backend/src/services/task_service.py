@@ -11,7 +11,8 @@ Security:
 """
 
 from sqlmodel import Session, select, func, col
-from sqlalchemy import case, nulls_last
+from sqlalchemy import bindparam, case, delete, insert, nulls_last
+from collections import defaultdict
 from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
@@ -21,12 +22,40 @@ from ..models.tag import Tag
 from ..models.task_tag import TaskTag
 from ..schemas.common import SortBy
 from .tag_service import TagService
+from .analytics_service import AnalyticsService
 from .exceptions import TaskNotFoundError, UnauthorizedError
+from .recurring_service import RecurringService
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+# Prepared statements for the per-request hot paths.
+# Built once at import time with bindparam() placeholders so SQLAlchemy's
+# compiled cache (and asyncpg's prepared-statement cache on PostgreSQL)
+# reuses the same parse/plan on every execution instead of recompiling
+# an identical query per request.
+_GET_TASK_STMT = select(Task).where(
+    Task.id == bindparam("task_id"),
+    Task.user_id == bindparam("user_id"),
+)
+
+# Ownership check and tag hydration in one round trip: each row carries
+# the task plus one tag name (NULL when the task has no tags). The model
+# keeps tags out of ORM relationships by design, so this stays an
+# explicit join rather than a selectinload.
+_GET_TASK_WITH_TAGS_STMT = (
+    select(Task, Tag.name)
+    .outerjoin(TaskTag, TaskTag.task_id == Task.id)
+    .outerjoin(Tag, Tag.id == TaskTag.tag_id)
+    .where(
+        Task.id == bindparam("task_id"),
+        Task.user_id == bindparam("user_id"),
+    )
+    .order_by(Tag.created_at)
+)
+
+
 class TaskService:
     """
     Service class for task business logic operations.
@@ -100,6 +129,7 @@ class TaskService:
                 recurrence_type=task_create.recurrence_type,
                 recurrence_interval=task_create.recurrence_interval,
                 recurrence_days=task_create.recurrence_days,
+                recurrence_days_mask=RecurringService.days_to_mask(task_create.recurrence_days),
                 recurrence_end_date=task_create.recurrence_end_date,
                 max_occurrences=task_create.max_occurrences,
                 # created_at and updated_at are set automatically by TimestampMixin
@@ -109,20 +139,28 @@ class TaskService:
             session.add(task)
             session.flush()  # Get task.id without committing
 
-            # Handle tags if provided
+            # Handle tags if provided (resolved in bulk: one SELECT + one
+            # INSERT for all names instead of a round trip per tag)
             tag_names = []
             if task_create.tags:
-                for tag_name in task_create.tags:
-                    # Create or get tag
-                    tag = TagService.create_or_get_tag(session, user_id, tag_name)
-                    tag_names.append(tag.name)
-
-                    # Create task-tag association
-                    task_tag = TaskTag(task_id=task.id, tag_id=tag.id)
-                    session.add(task_tag)
+                tags_by_name = TagService.get_or_create_tags_bulk(
+                    session, user_id, task_create.tags
+                )
+                tag_names = list(tags_by_name)
+
+                # Create all task-tag associations with one bulk INSERT
+                # instead of a flushed row per tag
+                session.execute(
+                    insert(TaskTag),
+                    [
+                        {"task_id": task.id, "tag_id": tag.id}
+                        for tag in tags_by_name.values()
+                    ],
+                )
 
             session.commit()
             session.refresh(task)
+            AnalyticsService.invalidate_user(user_id)
 
             logger.info(f"Created task {task.id} for user {user_id} with tags: {tag_names}")
 
@@ -183,10 +221,10 @@ class TaskService:
             )
         """
         try:
-            statement = select(Task).where(
-                (Task.id == task_id) & (Task.user_id == user_id)
-            )
-            task = session.exec(statement).first()
+            task = session.exec(
+                _GET_TASK_STMT,
+                params={"task_id": task_id, "user_id": user_id},
+            ).first()
 
             if task:
                 logger.info(f"Retrieved task {task_id} for user {user_id}")
@@ -320,16 +358,26 @@ class TaskService:
             paginated_query = base_query.offset(offset).limit(limit)
             tasks = session.exec(paginated_query).all()
 
+            # Fetch tags for the whole page in one query instead of one
+            # SELECT per task (classic N+1: 50 round trips for a 50-task
+            # page), then group task_id -> names in a single pass. Ordered
+            # by tag creation so each task's list matches the per-task
+            # query's table-order output.
+            tags_by_task: dict[UUID, List[str]] = defaultdict(list)
+            if tasks:
+                tag_query = (
+                    select(TaskTag.task_id, Tag.name)
+                    .join_from(Tag, TaskTag, Tag.id == TaskTag.tag_id)
+                    .where(TaskTag.task_id.in_([task.id for task in tasks]))
+                    .order_by(Tag.created_at)
+                )
+                for tag_task_id, tag_name in session.exec(tag_query).all():
+                    tags_by_task[tag_task_id].append(tag_name)
+
             # Build TaskResponse objects with tags
             task_responses = []
             for task in tasks:
-                # Get tags for this task
-                tag_query = (
-                    select(Tag.name)
-                    .join(TaskTag, Tag.id == TaskTag.tag_id)
-                    .where(TaskTag.task_id == task.id)
-                )
-                task_tag_names = list(session.exec(tag_query).all())
+                task_tag_names = tags_by_task[task.id]
 
                 task_responses.append(TaskResponse(
                     id=task.id,
@@ -400,40 +448,59 @@ class TaskService:
             )
         """
         try:
-            # Get task and verify ownership
-            task = TaskService.get_task_by_id(session, task_id, user_id)
-            if not task:
+            # Get task, verify ownership, and hydrate current tag names in
+            # a single query (one row per tag, same Task instance on each)
+            rows = session.exec(
+                _GET_TASK_WITH_TAGS_STMT,
+                params={"task_id": task_id, "user_id": user_id},
+            ).all()
+            if not rows:
                 logger.warning(f"Update attempt for non-existent task {task_id} by user {user_id}")
                 return None
+            task = rows[0][0]
+            existing_tag_names = [name for _, name in rows if name is not None]
 
             # Update only provided fields (except tags, which we handle separately)
             update_data = task_update.model_dump(exclude_unset=True, exclude={"tags"})
             for field, value in update_data.items():
                 setattr(task, field, value)
 
+            # Keep the denormalized weekday mask in sync with the day string
+            if "recurrence_days" in update_data:
+                task.recurrence_days_mask = RecurringService.days_to_mask(
+                    task.recurrence_days
+                )
+
             # Handle tags update if provided
             tag_names = []
             if task_update.tags is not None:  # Explicitly checking for None to allow empty list
-                # Delete existing tag associations
-                delete_stmt = select(TaskTag).where(TaskTag.task_id == task_id)
-                existing_task_tags = session.exec(delete_stmt).all()
-                for task_tag in existing_task_tags:
-                    session.delete(task_tag)
-
-                # Create new tag associations
-                for tag_name in task_update.tags:
-                    tag = TagService.create_or_get_tag(session, user_id, tag_name)
-                    tag_names.append(tag.name)
-                    task_tag = TaskTag(task_id=task_id, tag_id=tag.id)
-                    session.add(task_tag)
-            else:
-                # Tags not being updated, get existing tags
-                tag_query = (
-                    select(Tag.name)
-                    .join(TaskTag, Tag.id == TaskTag.tag_id)
+                # Delete existing tag associations in one statement instead
+                # of SELECTing them just to issue a DELETE per row; nothing
+                # here holds TaskTag instances, so skip session sync too
+                session.execute(
+                    delete(TaskTag)
                     .where(TaskTag.task_id == task_id)
+                    .execution_options(synchronize_session=False)
+                )
+
+                # Create new tag associations (tags resolved in bulk, rows
+                # inserted with one bulk INSERT)
+                tags_by_name = TagService.get_or_create_tags_bulk(
+                    session, user_id, task_update.tags
                 )
-                tag_names = list(session.exec(tag_query).all())
+                tag_names = list(tags_by_name)
+                if tags_by_name:
+                    session.execute(
+                        insert(TaskTag),
+                        [
+                            {"task_id": task_id, "tag_id": tag.id}
+                            for tag in tags_by_name.values()
+                        ],
+                    )
+            else:
+                # Tags not being updated; names already came back with the
+                # ownership-check query
+                tag_names = existing_tag_names
 
             # Update timestamp
             task.updated_at = datetime.utcnow()
@@ -441,6 +508,7 @@ class TaskService:
             session.add(task)
             session.commit()
             session.refresh(task)
+            AnalyticsService.invalidate_user(user_id)
 
             logger.info(f"Updated task {task_id} for user {user_id} with tags: {tag_names}")
 
@@ -509,6 +577,7 @@ class TaskService:
 
             session.delete(task)
             session.commit()
+            AnalyticsService.invalidate_user(user_id)
 
             logger.info(f"Deleted task {task_id} for user {user_id}")
             return True
@@ -7,9 +7,12 @@ Run this daily via cron or APScheduler.
 Reference: openai-agents-mcp-integration skill section 5.6
 """
 
-from datetime import datetime, timedelta
+import asyncio
+import re
+from datetime import date, datetime, timedelta, timezone
 from typing import Any
 
+from sqlalchemy import text
 from sqlmodel import Session, select
 import logging
 
@@ -21,11 +24,98 @@ logger = logging.getLogger(__name__)
 # Configuration for retention policy
 RETENTION_DAYS = 2
 
+# How many days of future partitions to keep pre-created (today + N)
+PARTITION_RUNWAY_DAYS = 2
+
+# Interval between in-app maintenance runs; comfortably inside the
+# PARTITION_RUNWAY_DAYS window so the runway never runs out while the
+# app is up, even if several runs fail in a row
+MAINTENANCE_INTERVAL_SECONDS = 6 * 60 * 60
+
+# Extracts the upper bound from pg_get_expr output like
+# "FOR VALUES FROM ('2026-08-29 00:00:00+00') TO ('2026-08-30 00:00:00+00')"
+_PARTITION_UPPER_BOUND_RE = re.compile(r"TO \('([^']+)'\)")
+
+
+def _messages_is_partitioned(session: Session) -> bool:
+    """Check whether the messages table is a partitioned parent (relkind 'p')."""
+    relkind = session.execute(
+        text(
+            "SELECT c.relkind FROM pg_class c "
+            "JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE c.relname = 'messages' AND n.nspname = current_schema()"
+        )
+    ).scalar()
+    return relkind == "p"
+
+
+def _drop_expired_partitions(session: Session, now: datetime) -> tuple[int, list[str]]:
+    """
+    Drop daily message partitions whose newest possible row has expired.
+
+    A partition with upper bound U holds rows created before U, which expire
+    by U + RETENTION_DAYS. Dropping the partition is a metadata-only
+    operation - no row rewrites, no index bloat, no autovacuum debt.
+
+    Returns:
+        tuple: (rows removed, names of dropped partitions)
+    """
+    rows = session.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = 'messages'"
+        )
+    ).all()
+
+    deleted_count = 0
+    dropped: list[str] = []
+    for relname, bound_expr in rows:
+        match = _PARTITION_UPPER_BOUND_RE.search(bound_expr or "")
+        if not match:
+            continue  # DEFAULT partition or unparsable bound - never drop
+        upper = datetime.fromisoformat(match.group(1))
+        if upper.tzinfo is not None:
+            upper = upper.astimezone(timezone.utc).replace(tzinfo=None)
+        if upper + timedelta(days=RETENTION_DAYS) <= now:
+            count = session.execute(
+                text(f'SELECT count(*) FROM "{relname}"')
+            ).scalar()
+            session.execute(text(f'DROP TABLE IF EXISTS "{relname}"'))
+            deleted_count += count or 0
+            dropped.append(relname)
+
+    if dropped:
+        session.commit()
+    return deleted_count, dropped
+
+
+def _ensure_upcoming_partitions(session: Session, today: date) -> None:
+    """Pre-create daily partitions for today through today + runway."""
+    for offset in range(PARTITION_RUNWAY_DAYS + 1):
+        day = today + timedelta(days=offset)
+        name = f"messages_p{day.strftime('%Y%m%d')}"
+        session.execute(
+            text(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF messages '
+                f"FOR VALUES FROM ('{day.isoformat()}') "
+                f"TO ('{(day + timedelta(days=1)).isoformat()}')"
+            )
+        )
+    session.commit()
+
 
 def cleanup_expired_messages() -> dict[str, Any]:
     """
     Delete messages where expires_at < now().
 
+    On partitioned Postgres (see migration f7c4b9e02a61) this drops whole
+    daily partitions - an O(1) metadata operation with zero vacuum cost -
+    and pre-creates upcoming partitions. On SQLite or an unpartitioned
+    table it falls back to row deletes.
+
     This is a SYNC function (not async) for background job compatibility.
     Uses Phase 2's sync engine for simplicity.
 
@@ -44,7 +134,31 @@ def cleanup_expired_messages() -> dict[str, Any]:
         try:
             now = datetime.utcnow()
 
-            # Query expired messages (expires_at < now)
+            # Fast path: partitioned Postgres - drop expired partitions
+            if (
+                session.get_bind().dialect.name == "postgresql"
+                and _messages_is_partitioned(session)
+            ):
+                deleted_count, dropped = _drop_expired_partitions(session, now)
+                _ensure_upcoming_partitions(session, now.date())
+
+                if dropped:
+                    logger.info(
+                        f"Dropped {len(dropped)} expired partitions "
+                        f"({deleted_count} messages) at {now.isoformat()}: {dropped}"
+                    )
+                else:
+                    logger.debug(f"No expired partitions found at {now.isoformat()}")
+
+                return {
+                    "success": True,
+                    "deleted_count": deleted_count,
+                    "dropped_partitions": dropped,
+                    "timestamp": now.isoformat(),
+                    "retention_days": RETENTION_DAYS,
+                }
+
+            # Fallback: row deletes (SQLite tests / unpartitioned databases)
             statement = select(Message).where(Message.expires_at < now)
             expired_messages = session.exec(statement).all()
 
@@ -75,6 +189,26 @@ def cleanup_expired_messages() -> dict[str, Any]:
             }
 
 
+async def run_retention_maintenance_loop() -> None:
+    """
+    Run cleanup_expired_messages periodically from the app lifespan.
+
+    The cron command and admin endpoint that call cleanup_expired_messages
+    are optional deployments; without this loop nothing in the running app
+    extends the daily partition runway, and message INSERTs would start
+    failing ("no partition of relation found") once the initial runway from
+    migration f7c4b9e02a61 ran out about two days after it was applied.
+
+    Runs once immediately at startup (covering restarts after downtime),
+    then every MAINTENANCE_INTERVAL_SECONDS. cleanup_expired_messages
+    catches and logs its own errors, so the loop only exits when the
+    lifespan cancels it at shutdown.
+    """
+    while True:
+        await asyncio.to_thread(cleanup_expired_messages)
+        await asyncio.sleep(MAINTENANCE_INTERVAL_SECONDS)
+
+
 def get_retention_stats() -> dict[str, Any]:
     """
     Get statistics about message retention status.
@@ -83,6 +83,7 @@ class TestCalculateNextDueDate:
         task.recurrence_type = recurrence_type
         task.recurrence_interval = interval
         task.recurrence_days = days
+        task.recurrence_days_mask = None  # Exercise the string-parsing fallback
         task.recurrence_end_date = end_date
         task.max_occurrences = None
         task.occurrence_count = 0
@@ -289,6 +290,7 @@ class TestShouldGenerateNext:
         task.due_date = due_date or date.today()
         task.recurrence_interval = 1
         task.recurrence_days = None
+        task.recurrence_days_mask = None
         task.recurrence_end_date = end_date
         task.max_occurrences = max_occurrences
         task.occurrence_count = occurrence_count
@@ -373,3 +375,81 @@ class TestAddYears:
         """Feb 29 + 4 years = Feb 29 (next leap year)."""
         result = RecurringService._add_years(date(2024, 2, 29), 4)
         assert result == date(2028, 2, 29)
+
+
+class TestProjectNextDates:
+    """Test bulk projection of upcoming occurrence dates."""
+
+    def create_task(
+        self,
+        due_date: date,
+        recurrence_type: RecurrenceType,
+        interval: int = 1,
+        days: str = None,
+        end_date: date = None,
+    ) -> Task:
+        """Helper to create a mock task with recurrence config."""
+        task = MagicMock(spec=Task)
+        task.id = uuid.uuid4()
+        task.is_recurring = True
+        task.due_date = due_date
+        task.recurrence_type = recurrence_type
+        task.recurrence_interval = interval
+        task.recurrence_days = days
+        task.recurrence_days_mask = None
+        task.recurrence_end_date = end_date
+        return task
+
+    def test_daily_projection(self):
+        """Daily projection returns consecutive days."""
+        task = self.create_task(date(2025, 1, 1), RecurrenceType.daily)
+        result = RecurringService.project_next_dates(task, 3)
+        assert result == [date(2025, 1, 2), date(2025, 1, 3), date(2025, 1, 4)]
+
+    def test_weekly_with_days_projection(self):
+        """Weekly projection follows the configured day pattern."""
+        # Wed Jan 1, 2025; mon/wed/fri pattern
+        task = self.create_task(
+            date(2025, 1, 1), RecurrenceType.weekly, days="mon,wed,fri"
+        )
+        result = RecurringService.project_next_dates(task, 4)
+        assert result == [
+            date(2025, 1, 3),   # Friday same week
+            date(2025, 1, 6),   # Monday next week
+            date(2025, 1, 8),   # Wednesday
+            date(2025, 1, 10),  # Friday
+        ]
+
+    def test_monthly_projection_clamps_progressively(self):
+        """Day clamps at a short month and stays clamped, like the scalar path."""
+        task = self.create_task(date(2025, 1, 31), RecurrenceType.monthly)
+        result = RecurringService.project_next_dates(task, 3)
+        assert result == [date(2025, 2, 28), date(2025, 3, 28), date(2025, 4, 28)]
+
+    def test_projection_matches_scalar_path(self):
+        """Projection equals repeated calculate_next_due_date application."""
+        task = self.create_task(
+            date(2025, 1, 1), RecurrenceType.weekly, interval=2, days="tue,sat"
+        )
+        expected = []
+        current = task.due_date
+        for _ in range(6):
+            task.due_date = current
+            current = RecurringService.calculate_next_due_date(task)
+            expected.append(current)
+        task.due_date = date(2025, 1, 1)
+        assert RecurringService.project_next_dates(task, 6) == expected
+
+    def test_projection_truncated_by_end_date(self):
+        """Dates past recurrence_end_date are dropped."""
+        task = self.create_task(
+            date(2025, 1, 1), RecurrenceType.daily, end_date=date(2025, 1, 3)
+        )
+        result = RecurringService.project_next_dates(task, 10)
+        assert result == [date(2025, 1, 2), date(2025, 1, 3)]
+
+    def test_projection_non_recurring_task(self):
+        """Non-recurring task projects nothing."""
+        task = self.create_task(date(2025, 1, 1), RecurrenceType.daily)
+        task.is_recurring = False
+        assert RecurringService.project_next_dates(task, 5) == []